@@ -43,17 +43,53 @@ import getpass
 import datetime
 # import json
 import configparser
-import base64
+import binascii
 import logging
 import logging.handlers as handlers
 import pathlib
 
-from eodms_rapi import EODMSRAPI
-
 from utils import eod as eod_util
 # from utils import csv_util
 # from utils import image
-# from utils import geo
+from utils import geo
+
+# Matches any run of whitespace (including newlines)
+_WS_RE = re.compile(r'\s+')
+
+# Valid order priority levels
+_PRIORITIES = frozenset(('low', 'medium', 'high', 'urgent'))
+
+# Resolved path of this script, used in the command-line syntax
+_SCRIPT_PATH = os.path.realpath(__file__)
+
+# The folder of this script and the config file it contains
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_CONFIG_FN = os.path.join(_SCRIPT_DIR, 'config.ini')
+
+# The banner printed when the script starts
+_BANNER = "\n%s\n# %-78s#\n%s" % ('#' * 81, __title__, '#' * 81)
+
+# The parsed config files by (filename, modification time)
+_CONFIG_CACHE = {}
+
+# The help of the command-line arguments which span multiple lines
+_INPUT_HELP = '''An input file, can either be an AOI or a CSV file 
+    exported from the EODMS UI. Valid AOI formats are GeoJSON, 
+    KML or Shapefile (Shapefile requires the GDAL Python package).'''
+_COLL_HELP = '''The collection of the images being ordered 
+    (separate multiple collections with a comma).'''
+_MAX_HELP = '''The maximum number of images to order and download 
+    and the maximum number of images per order, separated by a colon.'''
+_OUTPUT_HELP = '''The output file path containing the results in a geospatial format.
+The output parameter can be:
+- None (empty): No output will be created (a results CSV file will still be 
+    created in the 'results' folder)
+- GeoJSON: The output will be in the GeoJSON format 
+    (use extension .geojson or .json)
+- KML: The output will be in KML format (use extension .kml) (requires GDAL Python package) 
+- GML: The output will be in GML format (use extension .gml) (requires GDAL Python package) 
+- Shapefile: The output will be ESRI Shapefile (requires GDAL Python package) 
+    (use extension .shp)'''
         
 class Prompter():
     
@@ -61,7 +97,49 @@ class Prompter():
     Class used to prompt the user for all inputs.
     """
     
-    def __init__(self, eod, config_info, params):
+    # The steps used to get the AOI search parameters, each as the key 
+    #   of the parameter and the method used to ask for it
+    _AOI_STEPS = (('input', 'ask_aoi'), 
+                ('collections', 'ask_collection'), 
+                ('filters', 'ask_filter'), 
+                ('dates', 'ask_dates'), 
+                ('output', 'ask_output'))
+    
+    # The log message, parameter steps and Eodms_OrderDownload method of 
+    #   each process
+    _PROCESSES = {'full': ("Searching, ordering and downloading images " \
+                    "using an AOI.", _AOI_STEPS + \
+                    (('maximum', 'ask_maximum'), 
+                    ('priority', 'ask_priority')), 'search_orderDownload'), 
+                'order_csv': ("Ordering and downloading images using " \
+                    "results from a CSV file.", 
+                    (('input', 'ask_inputFile', "Enter the full path of " \
+                        "the CSV file exported from the EODMS UI website"), 
+                    ('output', 'ask_output'), 
+                    ('maximum', 'ask_maximum'), 
+                    ('priority', 'ask_priority')), 'order_csv'), 
+                'download_aoi': ("Downloading existing orders using an AOI.", 
+                    _AOI_STEPS, 'download_aoi'), 
+                'search_only': ("Searching for images using an AOI.", 
+                    _AOI_STEPS, 'search_only'), 
+                'download_only': ("Downloading images using results from " \
+                    "a CSV file from a previous session.", 
+                    (('input', 'ask_inputFile', "Enter the full path of " \
+                        "the CSV Results file from a previous session"), 
+                    ('output', 'ask_output')), 'download_only')}
+    
+    # The processes which can be run by the script
+    choices = {'full': 'Search, order & download images using ' \
+                'an AOI', \
+            'order_csv': 'Order & download images using EODMS UI ' \
+                'search results (CSV file)', 
+            'download_only': '''Download existing orders using a CSV file 
+        from a previous order/download process (files found under "results" 
+        folder)''', 
+            'search_only': 'Run only a search based on an AOI '\
+                'and input parameters'}
+    
+    def __init__(self, eod, config_info, params, parser, args):
         """
         Initializer for the Prompter class.
         
@@ -71,24 +149,109 @@ class Prompter():
         :type  config_info: dict
         :param params: An empty dictionary of parameters.
         :type  params: dict
+        :param parser: The parser for the command-line arguments.
+        :type  parser: argparse.ArgumentParser
+        :param args: The parsed command-line arguments.
+        :type  args: argparse.Namespace
         """
         
         self.eod = eod
         self.config_info = config_info
         self.params = params
+        self.parser = parser
+        self.args = args
         
         self.logger = logging.getLogger('eodms')
         
-        self.choices = {'full': 'Search, order & download images using ' \
-                    'an AOI', \
-                'order_csv': 'Order & download images using EODMS UI ' \
-                    'search results (CSV file)', 
-                'download_only': '''Download existing orders using a CSV file 
-        from a previous order/download process (files found under "results" 
-        folder)''', 
-                'search_only': 'Run only a search based on an AOI '\
-                    'and input parameters'}
+        # The functions used to read hidden and plain entries
+        self._read_password = getpass.getpass
+        self._read_plain = input
+        
+        # The menu of process choices shown to the user
+        self._menu = '\n'.join(["  %s: (%s) %s" % (idx + 1, v[0], \
+                        _WS_RE.sub(' ', v[1]).strip()) \
+                        for idx, v in enumerate(self.choices.items())])
+        
+    @staticmethod
+    def build_parser():
+        """
+        Builds the parser for the command-line arguments.
+        
+        :return: The parser for the command-line arguments.
+        :rtype: argparse.ArgumentParser
+        """
+        
+        parser = argparse.ArgumentParser(description='Search & Order EODMS ' \
+                            'products.', \
+                            formatter_class=argparse.RawTextHelpFormatter)
+        
+        parser.add_argument('-u', '--username', help='The username of ' \
+                        'the EODMS account used for authentication.')
+        parser.add_argument('-p', '--password', help='The password of ' \
+                            'the EODMS account used for authentication.')
+        parser.add_argument('-i', '--input', help=_INPUT_HELP)
+        parser.add_argument('-c', '--collections', help=_COLL_HELP)
+        parser.add_argument('-f', '--filters', help='A list of ' \
+                        'filters for a specific collection.')
+        parser.add_argument('-l', '--priority', help='The priority ' \
+                        'level of the order.\nOne of "Low", "Medium", ' \
+                        '"High" or "Urgent" (default "Medium").')
+        parser.add_argument('-d', '--dates', help='The date ranges ' \
+                        'for the search.')
+        parser.add_argument('-m', '--maximum', help=_MAX_HELP)
+        parser.add_argument('-r', '--process', help='The type of ' \
+                        'process to run from this list of options:\n- %s' % \
+                        '\n- '.join(["%s: %s" % (k, v) for k, v in \
+                        Prompter.choices.items()]))
+        parser.add_argument('-o', '--output', help=_OUTPUT_HELP)
+        parser.add_argument('-w', '--workers', help='The number of ' \
+                        'images downloaded at the same time (default 8).')
+        parser.add_argument('-s', '--silent', action='store_true', \
+                        help='Sets process to silent which supresses all ' \
+                        'questions.')
+        parser.add_argument('-v', '--version', action='store_true', \
+                        help='Prints the version of the script.')
+        
+        return parser
 
+    def _fail(self, err_msg):
+        """
+        Prints and logs an error entered by the user and exits the script.
+        
+        :param err_msg: The error message.
+        :type  err_msg: str
+        """
+        
+        self.eod.print_support(err_msg)
+        self.logger.error(err_msg)
+        sys.exit(1)
+        
+    def _opt_int(self, val, warning, limit=None):
+        """
+        Validates an optional integer entered by the user.
+        
+        :param val: The value entered by the user.
+        :type  val: str
+        :param warning: The warning to print if the value is not valid.
+        :type  warning: str
+        :param limit: The maximum allowed for the value.
+        :type  limit: int
+        
+        :return: The integer as a string or None if the value is blank or 
+                not valid.
+        :rtype: str
+        """
+        
+        if val is None or val == '': return None
+        
+        int_val = self.eod.validate_int(val, limit)
+        
+        if not int_val:
+            self.eod.print_msg("WARNING: %s" % warning, indent=False)
+            return None
+        
+        return str(int_val)
+        
     def ask_aoi(self, input_fn):
         """
         Asks the user for the geospatial input filename.
@@ -104,9 +267,7 @@ class Prompter():
                     
             if self.eod.silent:
                 err_msg = "No AOI file specified. Exiting process."
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
                 
             print("\n--------------Enter Input Geospatial File--------------")
             
@@ -117,24 +278,6 @@ class Prompter():
                     "Shapefile or GeoJSON file"
             input_fn = self.get_input(msg, err_msg)
             
-        if input_fn.find('.shp') > -1:
-            try:
-                import ogr
-                import osr
-                GDAL_INCLUDED = True
-            except ImportError:
-                try:
-                    import osgeo.ogr as ogr
-                    import osgeo.osr as osr
-                    GDAL_INCLUDED = True
-                except ImportError:
-                    err_msg = "Cannot open a Shapefile without GDAL. Please install " \
-                        "the GDAL Python package if you'd like to use a Shapefile " \
-                        "for your AOI."
-                    self.eod.print_support(err_msg)
-                    self.logger.error(err_msg)
-                    sys.exit(1)
-                    
         input_fn = input_fn.strip()
         input_fn = input_fn.strip("'")
         input_fn = input_fn.strip('"')
@@ -148,43 +291,55 @@ class Prompter():
         if not input_fn:
             sys.exit(1)
             
+        # A Shapefile can only be opened with GDAL
+        ext = os.path.splitext(input_fn)[1].lower()
+        if ext == '.shp' and not geo._load_gdal():
+            err_msg = "Cannot open a Shapefile without GDAL. Please install " \
+                "the GDAL Python package if you'd like to use a Shapefile " \
+                "for your AOI."
+            self._fail(err_msg)
+            
         return input_fn
         
-    def ask_collection(self, coll, coll_lst=None):
+    def ask_collection(self, coll):
         """
         Asks the user for the collection(s).
         
         :param coll: The collections if already set by the command-line.
         :type  coll: str
-        :param coll_lst: A list of collections retrieved from the RAPI.
-        :type  coll_lst: list
         
         :return: A list of collections entered by the user.
         :rtype: list
         """
         
+        # Get the collections available to the user (they are only 
+        #   retrieved from the RAPI once per session)
+        collections = self.eod.get_collections()
+        
+        if collections is None:
+            self._fail("Failed to retrieve a list of available collections.")
+        
+        coll_lst = [{'id': k, 'title': v['title']} for k, v in \
+                    collections.items()]
+        
         if coll is None:
-            
-            if coll_lst is None: 
-                coll_lst = self.eod.eodms_rapi.get_collections(True, opt='both')
                     
             if self.eod.silent:
                 err_msg = "No collection specified. Exiting process."
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
                 
             # print("coll_lst: %s" % coll_lst)            
             
             print("\n--------------Enter Collection--------------")
             
             # List available collections for this user
-            print("\nAvailable Collections:\n")
+            lines = ["\nAvailable Collections:\n"]
             for idx, c in enumerate(coll_lst):
                 msg = "%s. %s (%s)" % (idx + 1, c['title'], c['id'])
                 if c['id'] == 'NAPL':
                     msg += ' (open data only)'
-                print(msg)
+                lines.append(msg)
+            print('\n'.join(lines))
             
             # Prompted user for number(s) from list
             msg = "Enter the number of a collection from the list " \
@@ -204,9 +359,7 @@ class Prompter():
             if not check:
                 err_msg = "A valid Collection must be specified. " \
                             "Exiting process."
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
             
             coll = [coll_lst[int(i) - 1]['id'] for i in coll_vals if i.isdigit()]
         else:
@@ -219,9 +372,7 @@ class Prompter():
             check = self.eod.validate_collection(c)
             if not check:
                 err_msg = "Collection '%s' is not valid." % c
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
                 
         return coll
         
@@ -239,14 +390,13 @@ class Prompter():
         # Get the date range
         if dates is None:
             
-            if not self.eod.silent:
-                print("\n--------------Enter Date Range--------------")
-                
-                msg = "Enter a date range (ex: 20200525-20200630) " \
-                        "or a previous time-frame (24 hours) " \
-                        "(leave blank to search all years)\n"
-                dates = self.get_input(msg, required=False)
-                
+            print("\n--------------Enter Date Range--------------")
+            
+            msg = "Enter a date range (ex: 20200525-20200630) " \
+                    "or a previous time-frame (24 hours) " \
+                    "(leave blank to search all years)\n"
+            dates = self.get_input(msg, required=False)
+            
         #-------------------------------
         # Check validity of filter input
         #-------------------------------
@@ -255,9 +405,7 @@ class Prompter():
             
             if not dates:
                 err_msg = "The dates entered are invalid. "
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
                 
         return dates
                 
@@ -272,81 +420,85 @@ class Prompter():
         :rtype: dict
         """
         
+        fields = self.eod.get_fieldMap()
+        
+        # Get the Collection ID of each collection once
+        coll_ids = dict((coll, self.eod.get_collIdByName(coll)) for coll in \
+                    self.params['collections'])
+        
         if filters is None:
             filt_dict = {}
             
-            if not self.eod.silent:
-                
-                print("\n--------------Enter Filters--------------")
+            print("\n--------------Enter Filters--------------")
+            
+            # Ask for the filters for the given collection(s)
+            for coll in self.params['collections']:
+                coll_id = coll_ids[coll]
                 
-                # Ask for the filters for the given collection(s)
-                for coll in self.params['collections']:
-                    coll_id = self.eod.get_collIdByName(coll)
+                if coll_id in fields:
+                    field_map = fields[coll_id]
                     
-                    if coll_id in self.eod.get_fieldMap().keys():
-                        field_map = self.eod.get_fieldMap()[coll_id]
+                    print("\nAvailable fields for '%s':" % coll)
+                    for f in field_map.keys():
+                        print("  %s" % f)
                         
-                        print("\nAvailable fields for '%s':" % coll)
-                        for f in field_map.keys():
-                            print("  %s" % f)
-                            
-                        print("NOTE: Filters must be entered in the format " \
-                            "of <field_id>=<value>|<value>|... (field " \
-                            "IDs are not case sensitive); separate each " \
-                            "filter with a comma. To see a list " \
-                            "of field choices, enter '? <field_id>'.")
-                            
-                        msg = "Enter the filters you would like to apply " \
-                                "to the search"
+                    print("NOTE: Filters must be entered in the format " \
+                        "of <field_id>=<value>|<value>|... (field " \
+                        "IDs are not case sensitive); separate each " \
+                        "filter with a comma. To see a list " \
+                        "of field choices, enter '? <field_id>'.")
                         
-                        filt_items = '?'
+                    msg = "Enter the filters you would like to apply " \
+                            "to the search"
+                    
+                    filt_items = '?'
+                    
+                    while filt_items.find('?') > -1:
+                        filt_items = input("\n->> %s:\n" % msg)
                         
-                        while filt_items.find('?') > -1:
-                            filt_items = input("\n->> %s:\n" % msg)
+                        if filt_items.find('?') > -1:
+                            field_val = filt_items.replace('?', '').strip()
                             
-                            if filt_items.find('?') > -1:
-                                field_val = filt_items.replace('?', '').strip()
-                                
-                                field_title = field_map.get(field_val.upper())
+                            field_title = field_map.get(field_val.upper())
+                            
+                            if field_title is None:
+                                print("Not a valid field.")
+                                continue
+                            
+                            field_choices = self.eod.eodms_rapi.\
+                                get_fieldChoices(coll_id, field_title)
                                 
-                                if field_title is None:
-                                    print("Not a valid field.")
-                                    continue
+                            if isinstance(field_choices, dict):
+                                field_choices = 'any %s value' % \
+                                    field_choices['data_type']
+                            else:
+                                field_choices = ', '.join(field_choices)
                                 
-                                field_choices = self.eod.eodms_rapi.\
-                                    get_fieldChoices(coll_id, field_title)
-                                    
-                                if isinstance(field_choices, dict):
-                                    field_choices = 'any %s value' % \
-                                        field_choices['data_type']
-                                else:
-                                    field_choices = ', '.join(field_choices)
-                                    
-                                print("\nAvailable choices for '%s': %s" % \
-                                        (field_val, field_choices))
+                            print("\nAvailable choices for '%s': %s" % \
+                                    (field_val, field_choices))
+                    
+                    #filt_items = self.get_input(msg, required=False)
+                    
+                    if filt_items == '':
+                        filt_dict[coll_id] = []
+                    else:
                         
-                        #filt_items = self.get_input(msg, required=False)
+                        #-------------------------------
+                        # Check validity of filter input
+                        #-------------------------------
+                        filt_items = self.eod.validate_filters(filt_items, \
+                                        coll_id)
+                        
+                        if not filt_items:
+                            sys.exit(1)
+                        
+                        filt_items = filt_items.split(',')
+                        # In case the user put collections in filters
+                        filt_items = [f.split('.')[1] \
+                            if f.find('.') > -1 \
+                            else f for f in filt_items]
+                        filt_dict[coll_id] = filt_items
                         
-                        if filt_items == '':
-                            filt_dict[coll_id] = []
-                        else:
-                            
-                            #-------------------------------
-                            # Check validity of filter input
-                            #-------------------------------
-                            filt_items = self.eod.validate_filters(filt_items, \
-                                            coll_id)
-                            
-                            if not filt_items:
-                                sys.exit(1)
-                            
-                            filt_items = filt_items.split(',')
-                            # In case the user put collections in filters
-                            filt_items = [f.split('.')[1] \
-                                if f.find('.') > -1 \
-                                else f for f in filt_items]
-                            filt_dict[coll_id] = filt_items
-                            
         else:
             # User specified in command-line
             
@@ -359,31 +511,35 @@ class Prompter():
             
             filt_dict = {}
             
-            for coll in self.params['collections']:
-                # Split filters by comma
-                filt_lst = filters.split(',')
-                for f in filt_lst:
-                    if f == '': continue
-                    if f.find('.') > -1:
-                        coll_id, filt_items = f.split('.')
-                        filt_items = self.eod.validate_filters(filt_items, coll_id)
-                        if not filt_items:
-                            sys.exit(1)
-                        if coll_id in filt_dict.keys():
-                            coll_filters = filt_dict[coll_id]
-                        else:
-                            coll_filters = []
-                        coll_filters.append(filt_items.replace('"', '').\
-                            replace("'", ''))
-                        filt_dict[coll_id] = coll_filters
-                    else:
-                        coll_id = self.eod.get_collIdByName(coll)
-                        if coll_id in filt_dict.keys():
-                            coll_filters = filt_dict[coll_id]
-                        else:
-                            coll_filters = []
-                        coll_filters.append(f)
-                        filt_dict[coll_id] = coll_filters
+            # Split filters by comma
+            filt_lst = [f for f in filters.split(',') if f != '']
+            
+            # Add the filters which specify their collection and keep the 
+            #   others to apply to every collection
+            all_filts = []
+            # Validated filters by (filter, Collection ID) so repeated 
+            #   entries are only checked once
+            valid_filts = {}
+            for f in filt_lst:
+                if f.find('.') > -1:
+                    coll_id, filt_items = f.split('.', 1)
+                    key = (filt_items, coll_id)
+                    if key not in valid_filts:
+                        valid_filts[key] = self.eod.validate_filters(\
+                                            filt_items, coll_id)
+                    filt_items = valid_filts[key]
+                    if not filt_items:
+                        sys.exit(1)
+                    coll_filters = filt_dict.setdefault(coll_id, [])
+                    coll_filters.append(filt_items.replace('"', '').\
+                        replace("'", ''))
+                else:
+                    all_filts.append(f)
+            
+            if len(all_filts) > 0:
+                for coll in self.params['collections']:
+                    coll_filters = filt_dict.setdefault(coll_ids[coll], [])
+                    coll_filters += all_filts
                     
         return filt_dict
         
@@ -404,20 +560,17 @@ class Prompter():
             
             if self.eod.silent:
                 err_msg = "No CSV file specified. Exiting process."
-                self.eod.print_support(err_msg)
-                self.logger.error(err_msg)
-                sys.exit(1)
+                self._fail(err_msg)
                 
             print("\n--------------Enter Input CSV File--------------")
             
             err_msg = "No CSV specified. Please enter a valid CSV file"
             input_fn = self.get_input(msg, err_msg)
             
-        if not os.path.exists(input_fn):
+        if not input_fn.lower().endswith('.csv') or \
+            not os.path.exists(input_fn):
             err_msg = "Not a valid CSV file. Please enter a valid CSV file."
-            self.eod.print_support(err_msg)
-            self.logger.error(err_msg)
-            sys.exit(1)
+            self._fail(err_msg)
             
         return input_fn
         
@@ -434,52 +587,36 @@ class Prompter():
         
         if maximum is None or maximum == '':
                         
-            if not self.eod.silent:
-                if not self.process == 'order_csv':
-                    
-                    print("\n--------------Enter Maximums--------------")
-                    
-                    msg = "Enter the total number of images you'd " \
-                        "like to order (leave blank for no limit)"
-                    
-                    total_records = self.get_input(msg, required=False)
-                    
-                    #------------------------------------------
-                    # Check validity of the total_records entry
-                    #------------------------------------------
+            if not self.process == 'order_csv':
                 
-                    if total_records == '':
-                        total_records = None
-                    else:
-                        total_records = self.eod.validate_int(total_records)
-                        if not total_records:
-                            self.eod.print_msg("WARNING: Total number of images " \
-                                "value not valid. Excluding it.", indent=False)
-                            total_records = None
-                        else:
-                            total_records = str(total_records)
-                else:
-                    total_records = None
+                print("\n--------------Enter Maximums--------------")
                 
-                msg = "If you'd like a limit of images per order, " \
-                    "enter a value (EODMS sets a maximum limit of 100)"
-            
-                order_limit = self.get_input(msg, required=False)
+                msg = "Enter the total number of images you'd " \
+                    "like to order (leave blank for no limit)"
                 
-                if order_limit == '':
-                    order_limit = None
-                else:
-                    order_limit = self.eod.validate_int(order_limit, 100)
-                    if not order_limit:
-                        self.eod.print_msg("WARNING: Order limit value not " \
-                            "valid. Excluding it.", indent=False)
-                        order_limit = None
-                    else:
-                        order_limit = str(order_limit)
+                total_records = self.get_input(msg, required=False)
                 
-                maximum = ':'.join(filter(None, [total_records, \
-                            order_limit]))
-                            
+                #------------------------------------------
+                # Check validity of the total_records entry
+                #------------------------------------------
+                
+                total_records = self._opt_int(total_records, \
+                    "Total number of images value not valid. " \
+                    "Excluding it.")
+            else:
+                total_records = None
+            
+            msg = "If you'd like a limit of images per order, " \
+                "enter a value (EODMS sets a maximum limit of 100)"
+            
+            order_limit = self.get_input(msg, required=False)
+            
+            order_limit = self._opt_int(order_limit, "Order limit " \
+                "value not valid. Excluding it.", 100)
+            
+            maximum = ':'.join(v for v in (total_records, order_limit) \
+                        if v)
+                        
         else:
             
             if self.process == 'order_csv':
@@ -492,8 +629,8 @@ class Prompter():
                     total_records = None
                     order_limit = maximum
                     
-                maximum = ':'.join(filter(None, [total_records, \
-                                order_limit]))
+                maximum = ':'.join(v for v in (total_records, order_limit) \
+                            if v)
                             
         return maximum
         
@@ -510,14 +647,13 @@ class Prompter():
         
         if output is None:
                     
-            if not self.eod.silent:
-                print("\n--------------Enter Output Geospatial File--------------")
-                
-                msg = "\nEnter the path of the output geospatial file " \
-                    "(can also be GeoJSON, KML, GML or Shapefile) " \
-                    "(default is no output file)\n"
-                output = self.get_input(msg, required=False)
-                
+            print("\n--------------Enter Output Geospatial File--------------")
+            
+            msg = "\nEnter the path of the output geospatial file " \
+                "(can also be GeoJSON, KML, GML or Shapefile) " \
+                "(default is no output file)\n"
+            output = self.get_input(msg, required=False)
+            
         return output
         
     def ask_priority(self, priority):
@@ -531,24 +667,22 @@ class Prompter():
         :rtype: str
         """
         
-        priorities = ['low', 'medium', 'high', 'urgent']
-        
         if priority is None:
-            if not self.eod.silent:
-                
-                print("\n--------------Enter Priority--------------")
-                
-                msg = "Enter the priority level for the order ('Low', " \
-                        "'Medium', 'High', 'Urgent') [Medium]"
-                        
-                priority = self.get_input(msg, required=False)
+            print("\n--------------Enter Priority--------------")
+            
+            msg = "Enter the priority level for the order ('Low', " \
+                    "'Medium', 'High', 'Urgent') [Medium]"
+                    
+            priority = self.get_input(msg, required=False)
             
         if priority is None or priority == '':
             priority = 'Medium'
-        elif priority.lower() not in priorities:
+        elif priority.lower() not in _PRIORITIES:
             self.eod.print_msg("WARNING: Not a valid 'priority' entry. " \
                 "Setting priority to 'Medium'.", indent=False)
             priority = 'Medium'
+            
+        return priority
 
     def ask_process(self):
         """
@@ -558,41 +692,30 @@ class Prompter():
         :rtype: str
         """
         
-        if self.eod.silent:
+        print("\n--------------Choose Process Option--------------")
+        
+        print("\nWhat would you like to do?\n\n%s\n" % self._menu)
+        process = input("->> Please choose the type of process [1]: ")
+                
+        if process == '':
             process = 'full'
         else:
-            print("\n--------------Choose Process Option--------------")
-        
-            choices = '\n'.join(["  %s: (%s) %s" % (idx + 1, v[0], \
-                        re.sub(r'\s+', ' ', v[1].replace('\n', ''))) \
-                        for idx, v in enumerate(self.choices.items())])
+            # Set process value and check its validity
             
-            print("\nWhat would you like to do?\n\n%s\n" % choices)
-            process = input("->> Please choose the type of process [1]: ")
-                    
-            if process == '':
-                process = 'full'
+            process = self.eod.validate_int(process)
+            
+            if not process:
+                err_msg = "Invalid value entered for the 'process' " \
+                            "parameter."
+                self._fail(err_msg)
+            
+            if process > len(self.choices.keys()):
+                err_msg = "Invalid value entered for the 'process' " \
+                            "parameter."
+                self._fail(err_msg)
             else:
-                # Set process value and check its validity
-                
-                process = self.eod.validate_int(process)
+                process = list(self.choices.keys())[int(process) - 1]
                 
-                if not process:
-                    err_msg = "Invalid value entered for the 'process' " \
-                                "parameter."
-                    self.eod.print_support(err_msg)
-                    self.logger.error(err_msg)
-                    sys.exit(1)
-                
-                if process > len(self.choices.keys()):
-                    err_msg = "Invalid value entered for the 'process' " \
-                                "parameter."
-                    self.eod.print_support(err_msg)
-                    self.logger.error(err_msg)
-                    sys.exit(1)
-                else:
-                    process = list(self.choices.keys())[int(process) - 1]
-                    
         return process
 
     def build_syntax(self):
@@ -603,15 +726,15 @@ class Prompter():
         :rtype: str
         """
         
-        # Get the actions of the argparse
-        actions = self.parser._option_string_actions
+        # Get the optional arguments of the argparse by their destination
+        by_dest = dict((a.dest, a) for a in self.parser._actions \
+                    if a.option_strings)
         
         syntax_params = []
         for p, pv in self.params.items():
             if pv is None or pv == '': continue
-            if p == 'session': continue
-            if p == 'eodms_rapi': continue
-            action = actions['--%s' % p]
+            action = by_dest.get(p)
+            if action is None: continue
             flag = action.option_strings[0]
             
             if isinstance(pv, list):
@@ -639,7 +762,7 @@ class Prompter():
             
             syntax_params.append('%s %s' % (flag, pv))
             
-        out_syntax = "python %s %s -s" % (os.path.realpath(__file__), \
+        out_syntax = "python %s %s -s" % (_SCRIPT_PATH, \
                         ' '.join(syntax_params))
         
         return out_syntax
@@ -663,17 +786,15 @@ class Prompter():
         
         if password:
             # If the argument is for password entry, hide entry
-            in_val = getpass.getpass(prompt='->> %s: ' % msg)
+            in_val = self._read_password('->> %s: ' % msg)
         else:
             output = "\n->> %s: " % msg
             if msg.endswith('\n'):
                 output = "\n->> %s:\n" % msg.strip('\n')
-            in_val = input(output)
+            in_val = self._read_plain(output)
             
         if required and in_val == '':
-            eod_util.Eodms_OrderDownload().print_support(err_msg)
-            self.logger.error(err_msg)
-            sys.exit(1)
+            self._fail(err_msg)
             
         return in_val
         
@@ -685,60 +806,14 @@ class Prompter():
         print("\nUse this command-line syntax to run the same parameters:")
         cli_syntax = self.build_syntax()
         print(cli_syntax)
-        self.logger.info("Command-line Syntax: %s" % cli_syntax)
+        self.logger.info("Command-line Syntax: %s", cli_syntax)
         
     def prompt(self):
         """
         Prompts the user for the input options.
         """
         
-        self.parser = argparse.ArgumentParser(description='Search & Order EODMS ' \
-                            'products.', \
-                            formatter_class=argparse.RawTextHelpFormatter)
-        
-        self.parser.add_argument('-u', '--username', help='The username of ' \
-                        'the EODMS account used for authentication.')
-        self.parser.add_argument('-p', '--password', help='The password of ' \
-                            'the EODMS account used for authentication.')
-        input_help = '''An input file, can either be an AOI or a CSV file 
-    exported from the EODMS UI. Valid AOI formats are GeoJSON, 
-    KML or Shapefile (Shapefile requires the GDAL Python package).'''
-        self.parser.add_argument('-i', '--input', help=input_help)
-        coll_help = '''The collection of the images being ordered 
-    (separate multiple collections with a comma).'''
-        self.parser.add_argument('-c', '--collections', help=coll_help)
-        self.parser.add_argument('-f', '--filters', help='A list of ' \
-                        'filters for a specific collection.')
-        self.parser.add_argument('-l', '--priority', help='The priority ' \
-                        'level of the order.\nOne of "Low", "Medium", ' \
-                        '"High" or "Urgent" (default "Medium").')
-        self.parser.add_argument('-d', '--dates', help='The date ranges ' \
-                        'for the search.')
-        max_help = '''The maximum number of images to order and download 
-    and the maximum number of images per order, separated by a colon.'''
-        self.parser.add_argument('-m', '--maximum', help=max_help)
-        self.parser.add_argument('-r', '--process', help='The type of ' \
-                        'process to run from this list of options:\n- %s' % \
-                        '\n- '.join(["%s: %s" % (k, v) for k, v in \
-                        self.choices.items()]))
-        output_help = '''The output file path containing the results in a geospatial format.
-The output parameter can be:
-- None (empty): No output will be created (a results CSV file will still be 
-    created in the 'results' folder)
-- GeoJSON: The output will be in the GeoJSON format 
-    (use extension .geojson or .json)
-- KML: The output will be in KML format (use extension .kml) (requires GDAL Python package) 
-- GML: The output will be in GML format (use extension .gml) (requires GDAL Python package) 
-- Shapefile: The output will be ESRI Shapefile (requires GDAL Python package) 
-    (use extension .shp)'''
-        self.parser.add_argument('-o', '--output', help=output_help)
-        self.parser.add_argument('-s', '--silent', action='store_true', \
-                        help='Sets process to silent which supresses all ' \
-                        'questions.')
-        self.parser.add_argument('-v', '--version', action='store_true', \
-                        help='Prints the version of the script.')
-        
-        args = self.parser.parse_args()
+        args = self.args
         
         user = args.username
         password = args.password
@@ -752,22 +827,29 @@ The output parameter can be:
         output = args.output
         silent = args.silent
         version = args.version
+        workers = args.workers
         
         if version:
             print("%s: Version %s" % (__title__, __version__))
             sys.exit(0)
         
         self.eod.set_silence(silent)
+        
+        if workers is not None:
+            self.eod.set_downloadWorkers(workers)
                 
         new_user = False
         new_pass = False
         
+        # Get the RAPI settings from the config file once
+        rapi_config = dict(self.config_info.items('RAPI'))
+        
         if user is None or password is None:
             print("\n--------------Enter EODMS Credentials--------------")
         
         if user is None:
             
-            user = self.config_info.get('RAPI', 'username')
+            user = rapi_config.get('username', '')
             if user == '':
                 msg = "Enter the username for authentication"
                 err_msg = "A username is required to order images."
@@ -778,7 +860,7 @@ The output parameter can be:
                 
         if password is None:
             
-            password = self.config_info.get('RAPI', 'password')
+            password = rapi_config.get('password', '')
             
             if password == '':
                 msg = 'Enter the password for authentication'
@@ -786,7 +868,7 @@ The output parameter can be:
                 password = self.get_input(msg, err_msg, password=True)
                 new_pass = True
             else:
-                password = base64.b64decode(password).decode("utf-8")
+                password = binascii.a2b_base64(password).decode("utf-8")
                 print("Using the password set in the 'config.ini' file...")
                 
         if new_user or new_pass:
@@ -797,21 +879,23 @@ The output parameter can be:
             
             answer = input("\n->> Would you like to store the credentials " \
                     "for a future session%s? (y/n):" % suggestion)
-            if answer.lower().find('y') > -1:
-                self.config_info.set('RAPI', 'username', user)
-                pass_enc = base64.b64encode(password.encode("utf-8")).decode("utf-8")
-                self.config_info.set('RAPI', 'password', \
-                    str(pass_enc))
+            if answer[:1].lower() == 'y':
+                pass_enc = binascii.b2a_base64(password.encode("utf-8"), \
+                            newline=False).decode("ascii")
+                self.config_info.read_dict({'RAPI': {'username': user, 
+                                            'password': pass_enc}})
                 
-                config_fn = os.path.join(os.path.dirname(\
-                            os.path.abspath(__file__)), \
-                            'config.ini')
-                cfgfile = open(config_fn, 'w')
-                self.config_info.write(cfgfile, space_around_delimiters=False)
-                cfgfile.close()
+                # Write to a temporary file first so the config file is 
+                #   never left partially written
+                tmp_fn = '%s.tmp' % _CONFIG_FN
+                with open(tmp_fn, 'w') as cfgfile:
+                    self.config_info.write(cfgfile, \
+                        space_around_delimiters=False)
+                os.replace(tmp_fn, _CONFIG_FN)
+                _CONFIG_CACHE.clear()
         
         # Get number of attempts when querying the RAPI
-        self.eod.set_attempts(self.config_info.get('RAPI', 'access_attempts'))
+        self.eod.set_attempts(rapi_config.get('access_attempts', ''))
         
         self.eod.create_session(user, password)
         
@@ -822,13 +906,6 @@ The output parameter can be:
                         'process': process}
         
         print()
-        coll_lst = self.eod.eodms_rapi.get_collections(True)
-        
-        if coll_lst is None:
-            msg = "Failed to retrieve a list of available collections."
-            self.logger.error(msg)
-            self.eod.print_support(msg)
-            sys.exit(1)
         
         print("\n(For more information on the following prompts, please refer" \
                 " to the README file.)")
@@ -844,138 +921,152 @@ The output parameter can be:
                     
         self.params['process'] = self.process
         
-        if self.process == 'full':
-            
-            self.logger.info("Searching, ordering and downloading images " \
-                        "using an AOI.")
-                        
-            # Get the AOI file
-            input_fn = self.ask_aoi(input_fn)
-            self.params['input'] = input_fn
-            
-            # Get the collection(s)
-            coll = self.ask_collection(coll)
-            self.params['collections'] = coll
-            
-            # Get the filter(s)
-            filt_dict = self.ask_filter(filters)
-            self.params['filters'] = filt_dict
-            
-            # Get the date(s)
-            dates = self.ask_dates(dates)
-            self.params['dates'] = dates
-            
-            # Get the output geospatial filename
-            output = self.ask_output(output)
-            self.params['output'] = output
-            
-            # Get the maximum(s)
-            maximum = self.ask_maximum(maximum)
-            self.params['maximum'] = maximum
-            
-            # Get the priority
-            priority = self.ask_priority(priority)       
-            self.params['priority'] = priority
-            
-            # Print command-line syntax for future processes
-            self.print_syntax()
-            
-            self.eod.search_orderDownload(self.params)
-            
-        elif self.process == 'order_csv':
-            
-            self.logger.info("Ordering and downloading images using results " \
-                        "from a CSV file.")
-            
-            #########################################
-            # Get the CSV file
-            #########################################
-            
-            msg = "Enter the full path of the CSV file exported "\
-                        "from the EODMS UI website"
-            input_fn = self.ask_inputFile(input_fn, msg)
-            self.params['input'] = input_fn
-            
-            # Get the output geospatial filename
-            output = self.ask_output(output)
-            self.params['output'] = output
-            
-            # Get the maximum(s)
-            maximum = self.ask_maximum(maximum)
-            self.params['maximum'] = maximum
-            
-            # Get the priority
-            priority = self.ask_priority(priority)
-            self.params['priority'] = priority
-            
-            # Print command-line syntax for future processes
-            self.print_syntax()
-            
-            # Run the order_csv process
-            self.eod.order_csv(self.params)
-            
-        elif self.process == 'download_aoi' or self.process == 'search_only':
-            
-            if self.process == 'download_aoi':
-                self.logger.info("Downloading existing orders using an AOI.")
-            else:
-                self.logger.info("Searching for images using an AOI.")
-            
-            # Get the AOI file
-            input_fn = self.ask_aoi(input_fn)
-            self.params['input'] = input_fn
-            
-            # Get the collection(s)
-            coll = self.ask_collection(coll)
-            self.params['collections'] = coll
-            
-            # Get the filter(s)
-            filt_dict = self.ask_filter(filters)
-            self.params['filters'] = filt_dict
-            
-            # Get the date(s)
-            dates = self.ask_dates(dates)
-            self.params['dates'] = dates
-            
-            # Get the output geospatial filename
-            output = self.ask_output(output)
-            self.params['output'] = output
-            
-            # Print command-line syntax for future processes
-            self.print_syntax()
-            
-            if self.process == 'download_aoi':
-                self.eod.download_aoi(self.params)
-            else:
-                self.eod.search_only(self.params)
-            
-        elif self.process == 'download_only':
-            # Download existing orders using CSV file from previous session
-            
-            self.logger.info("Downloading images using results from a CSV " \
-                        "file from a previous session.")
-            
-            # Get the CSV file
-            msg = "Enter the full path of the CSV Results file from a " \
-                "previous session"
-            input_fn = self.ask_inputFile(input_fn, msg)
-            self.params['input'] = input_fn
-            
-            # Get the output geospatial filename
-            output = self.ask_output(output)
-            self.params['output'] = output
-            
-            # Print command-line syntax for future processes
-            self.print_syntax()
-            
-            # Run the download_only process
-            self.eod.download_only(self.params)
+        proc = self._PROCESSES.get(self.process)
         
-        else:
+        if proc is None:
             self.eod.print_support("That is not a valid process type.")
             self.logger.error("An invalid parameter was entered during the prompt.")
             sys.exit(1)
+        
+        log_msg, steps, run = proc
+        
+        self.logger.info(log_msg)
+        
+        # Get the parameters required by the process
+        values = {'input': input_fn, 
+                    'collections': coll, 
+                    'filters': filters, 
+                    'dates': dates, 
+                    'output': output, 
+                    'maximum': maximum, 
+                    'priority': priority}
+        for key, step, *args in steps:
+            self.params[key] = getattr(self, step)(values[key], *args)
+        
+        # Print command-line syntax for future processes
+        self.print_syntax()
+        
+        # Run the process
+        getattr(self.eod, run)(self.params)
 
+class SilentPrompter(Prompter):
+    
+    """
+    Prompter used when the script runs in silent mode. Any value not set 
+        in the command-line is left empty without prompting the user.
+    """
+    
+    def ask_dates(self, dates):
+        """
+        Validates the dates set by the command-line, if any.
+        
+        :param dates: The dates if already set by the command-line.
+        :type  dates: str
+        
+        :return: The dates.
+        :rtype: str
+        """
+        
+        if dates is None: return None
+        
+        return Prompter.ask_dates(self, dates)
+        
+    def ask_filter(self, filters):
+        """
+        Parses the search filters set by the command-line, if any.
+        
+        :param filters: The filters if already set by the command-line.
+        :type  filters: str
+        
+        :return: A dictionary containing the filters.
+        :rtype: dict
+        """
+        
+        if filters is None: return {}
+        
+        return Prompter.ask_filter(self, filters)
+        
+    def ask_maximum(self, maximum):
+        """
+        Gets the maximums set by the command-line, if any.
+        
+        :param maximum: The maximum if already set by the command-line.
+        :type  maximum: str
+        
+        :return: The maximum number of order items and/or number of items 
+                per order, separated by ':'.
+        :rtype: str
+        """
+        
+        if maximum is None or maximum == '': return maximum
+        
+        return Prompter.ask_maximum(self, maximum)
+        
+    def ask_output(self, output):
+        """
+        Gets the output geospatial file set by the command-line, if any.
+        
+        :param output: The output if already set by the command-line.
+        :type  output: str
+        
+        :return: The output geospatial filename.
+        :rtype: str
+        """
+        
+        return output
+        
+    def ask_priority(self, priority):
+        """
+        Gets the priority set by the command-line, if any.
+        
+        :param priority: The priority if already set by the command-line.
+        :type  priority: str
+        
+        :return: The priority level.
+        :rtype: str
+        """
+        
+        if priority is None: priority = ''
+        
+        return Prompter.ask_priority(self, priority)
+        
+    def ask_process(self):
+        """
+        Gets the default process since the user cannot be asked.
+        
+        :return: The value of the default process.
+        :rtype: str
+        """
+        
+        return 'full'
+        
+def get_prompter(eod, config_info, params):
+    """
+    Creates the Prompter used for the session, based on whether the script 
+        was started in silent mode. The silent mode of the 
+        Eodms_OrderDownload is set from the command-line.
+    
+    :param eod: The Eodms_OrderDownload object.
+    :type  eod: Eodms_OrderDownload
+    :param config_info: Configuration information taken from the config file.
+    :type  config_info: dict
+    :param params: An empty dictionary of parameters.
+    :type  params: dict
+    
+    :return: The Prompter for the session.
+    :rtype: Prompter
+    """
+    
+    # Parse the command-line once; the chosen Prompter reuses the arguments
+    parser = Prompter.build_parser()
+    args = parser.parse_args()
+    eod.set_silence(args.silent)
+    
+    if eod.silent:
+        return SilentPrompter(eod, config_info, params, parser, args)
+    
+    return Prompter(eod, config_info, params, parser, args)
+    
 def get_config():
     """
     Gets the configuration information from the config file.
@@ -984,15 +1075,42 @@ def get_config():
     :rtype: configparser.ConfigParser
     """
     
-    config = configparser.ConfigParser()
+    try:
+        mtime = os.stat(_CONFIG_FN).st_mtime_ns
+    except OSError:
+        mtime = None
     
-    config_fn = os.path.join(os.path.dirname(os.path.abspath(__file__)), \
-                'config.ini')
+    key = (_CONFIG_FN, mtime)
+    config = _CONFIG_CACHE.get(key)
     
-    config.read(config_fn)
+    if config is None:
+        config = configparser.ConfigParser()
+        config.read(_CONFIG_FN)
+        _CONFIG_CACHE[key] = config
     
     return config
     
+def _resolve(path, default):
+    """
+    Resolves a path from the config file relative to the script folder.
+    
+    :param path: The path from the config file.
+    :type  path: str
+    :param default: The path, relative to the script folder, used if the 
+            path is empty.
+    :type  default: str
+    
+    :return: The absolute path.
+    :rtype: str
+    """
+    
+    if path == '':
+        path = default
+    elif os.path.isabs(path):
+        return path
+    
+    return os.path.join(_SCRIPT_DIR, path)
+    
 def print_support(err_str=None):
     """
     Prints the 2 different support message depending if an error occurred.
@@ -1001,24 +1119,30 @@ def print_support(err_str=None):
     :type  err_str: str
     """
     
-    eod_util.Eodms_OrderDownload().print_support(err_str)
+    if err_str is None:
+        print("\nIf you have any questions or require support, " \
+                "please contact the EODMS Support Team at %s" % __email__)
+    else:
+        print("\nERROR: %s" % err_str)
+        
+        print("\nExiting process.")
+        
+        print("\nFor help, please contact the EODMS Support Team at " \
+                "%s" % __email__)
         
 def main():
     
     cmd_title = "EODMS Orderer-Downloader"
-    os.system("title " + cmd_title)
+    if sys.platform == 'win32':
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleTitleW(cmd_title)
     sys.stdout.write("\x1b]2;%s\x07" % cmd_title)
     
     if '-v' in sys.argv or '--v' in sys.argv or '--version' in sys.argv:
         print("\n  %s, version %s" % (__title__, __version__))
         sys.exit(0)
     
-    print("\n##########################################################" \
-            "#######################")
-    print("# %s                           " \
-            "                    #" % __title__)
-    print("############################################################" \
-            "#####################")
+    print(_BANNER)
 
     # Create info folder, if it doesn't exist, to store CSV files
     start_time = datetime.datetime.now()
@@ -1026,37 +1150,21 @@ def main():
     
     try:
         
+        eod = None
         params = {}
         
         # Set all the parameters from the config.ini file
         config_info = get_config()
         
-        abs_path = os.path.abspath(__file__)
-        download_path = config_info.get('Script', 'downloads')
-        if download_path == '':
-            download_path = os.path.join(os.path.dirname(abs_path), \
-                                    'downloads')
-        elif not os.path.isabs(download_path):
-            download_path = os.path.join(os.path.dirname(abs_path), \
-                                    download_path)
+        download_path = _resolve(config_info.get('Script', 'downloads'), \
+                            'downloads')
             
         print("\nImages will be downloaded to '%s'." % download_path)
         
-        res_path = config_info.get('Script', 'results')
-        if res_path == '':
-            res_path = os.path.join(os.path.dirname(abs_path), \
-                                    'results')
-        elif not os.path.isabs(res_path):
-            res_path = os.path.join(os.path.dirname(abs_path), \
-                                    res_path)
-            
-        log_loc = config_info.get('Script', 'log')
-        if log_loc == '':
-            log_loc = os.path.join(os.path.dirname(abs_path), \
-                                    'log', 'logger.log')
-        elif not os.path.isabs(log_loc):
-            log_loc = os.path.join(os.path.dirname(abs_path), \
-                                    log_loc)
+        res_path = _resolve(config_info.get('Script', 'results'), 'results')
+        
+        log_loc = _resolve(config_info.get('Script', 'log'), \
+                            os.path.join('log', 'logger.log'))
             
         # Setup logging
         logger = logging.getLogger('EODMSRAPI')
@@ -1073,9 +1181,14 @@ def main():
                         maxBytes=500000, backupCount=2)
         logHandler.setLevel(logging.DEBUG)
         logHandler.setFormatter(formatter)
-        logger.addHandler(logHandler)
         
-        logger.info("Script start time: %s" % start_str)
+        # Buffer the log records so they are written to the file in batches
+        #   (errors are written right away)
+        memHandler = handlers.MemoryHandler(512, flushLevel=logging.ERROR, \
+                        target=logHandler, flushOnClose=True)
+        logger.addHandler(memHandler)
+        
+        logger.info("Script start time: %s", start_str)
         
         # for k,v in logging.Logger.manager.loggerDict.items()  :
             # print('+ [%s] {%s} ' % (str.ljust( k, 20)  , str(v.__class__)[8:-2]) ) 
@@ -1111,7 +1224,7 @@ def main():
         # Get authentication if not specified
         #########################################
         
-        prmpt = Prompter(eod, config_info, params)
+        prmpt = get_prompter(eod, config_info, params)
         
         prmpt.prompt()
             
@@ -1123,20 +1236,20 @@ def main():
         msg = "Process ended by user."
         print("\n%s" % msg)
         
-        if 'eod' in vars() or 'eod' in globals():
+        if eod is not None:
             eod.print_support()
             eod.export_results()
         else:
-            eod_util.Eodms_OrderDownload().print_support()
+            print_support()
         logger.info(msg)
         sys.exit(1)
     except Exception:
         trc_back = "\n%s" % traceback.format_exc()
-        if 'eod' in vars() or 'eod' in globals():
+        if eod is not None:
             eod.print_support(trc_back)
             eod.export_results()
         else:
-            eod_util.Eodms_OrderDownload().print_support(trc_back)
+            print_support(trc_back)
         logger.error(traceback.format_exc())
 
 if __name__ == '__main__':
@@ -0,0 +1,108 @@
+##############################################################################
+# MIT License
+#
+# Copyright (c) 2020-2021 Her Majesty the Queen in Right of Canada, as
+# represented by the President of the Treasury Board
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+#
+##############################################################################
+
+import threading
+import unittest
+from unittest import mock
+
+from utils import eod as eod_util
+
+class FakeRAPI:
+    """
+    Stand-in for the EODMSRAPI which counts the instances created and the
+        number of times the collections are requested from the RAPI.
+    """
+
+    lock = threading.Lock()
+    created = 0
+    fetches = 0
+
+    def __init__(self, username, password):
+        with FakeRAPI.lock:
+            FakeRAPI.created += 1
+        self.rapi_collections = {}
+
+    def get_collections(self, as_list=False, opt='id', redo=False):
+        if not self.rapi_collections:
+            with FakeRAPI.lock:
+                FakeRAPI.fetches += 1
+            self.rapi_collections = {
+                'RCMImageProducts': {'title': 'RCM Image Products',
+                                    'aliases': ['rcm'], 'fields': {}},
+                'Radarsat2': {'title': 'Radarsat-2',
+                                    'aliases': ['r2'], 'fields': {}}}
+        return self.rapi_collections
+
+    def search(self, coll_id, filters=None, *args):
+        self.get_collections()
+        self.results = []
+
+    def get_results(self):
+        return self.results
+
+    def get_ordersByRecords(self, records):
+        return []
+
+class TestThreads(unittest.TestCase):
+
+    def setUp(self):
+        FakeRAPI.created = 0
+        FakeRAPI.fetches = 0
+
+        patcher = mock.patch('eodms_rapi.EODMSRAPI', FakeRAPI)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.eod = eod_util.Eodms_OrderDownload()
+        self.eod.create_session('user', 'pass')
+        self.addCleanup(self.eod._shutdown_threads)
+
+    def test_run_threads_fetches_collections_once(self):
+        self.eod.get_collections()
+
+        for _ in range(3):
+            self.eod._run_threads(lambda c: self.eod._search_batch(c, None), \
+                ['RCMImageProducts'] * 10)
+
+        self.assertEqual(FakeRAPI.fetches, 1)
+
+    def test_query_entries_fetches_collections_once(self):
+        for _ in range(3):
+            self.eod.query_entries(['RCMImageProducts', 'Radarsat2'], \
+                aoi='aoi.geojson')
+
+        self.assertEqual(FakeRAPI.fetches, 1)
+
+    def test_run_threads_reuses_thread_instances(self):
+        for _ in range(3):
+            self.eod._run_threads(lambda c: self.eod._get_threadRapi().\
+                get_ordersByRecords(c), [[{'recordId': 1}]] * 10)
+
+        # The main instance plus at most one instance per worker
+        self.assertLessEqual(FakeRAPI.created, 1 + self.eod.max_workers)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -141,8 +141,7 @@ class EODMS_CSV:
         :type  results: ImageList or OrderList
         """
         
-        if not os.path.exists(self.eod.results_path):
-            os.mkdir(self.eod.results_path)
+        os.makedirs(self.eod.results_path, exist_ok=True)
         
         # # Create the query results CSV
         self.open()
@@ -182,31 +181,30 @@ class EODMS_CSV:
             logger.error(err_msg)
             sys.exit(1)
         
-    def import_eodmsCSV(self):
+    def iter_eodmsCSV(self):
         
         """
-        Imports the rows from the EODMS CSV file into a dictionary of records.
+        Reads the rows from the EODMS CSV file one record at a time.
         
-        :return: A list of records extracted from the CSV file.
-        :rtype: list
+        :return: A generator of the records extracted from the CSV file.
+        :rtype: generator
         """
         
         # Open the input file
-        in_f = open(self.csv_fn, 'r')
-        in_lines = self.get_lines(in_f)
-        
-        # Get the header from the first row
-        in_header = in_lines[0].lower().replace('\n', '').split(',')
-        
-        # Check for columns in input file
-        if 'sequence id' not in in_header and \
-            'order key' not in in_header and \
-            'downlink segment id' not in in_header and \
-            'image id' not in in_header and \
-            'record id' not in in_header and \
-            'recordid' not in in_header and \
-            'image info' not in in_header:
-            err_msg = '''The input file does not contain the proper columns.
+        with open(self.csv_fn, 'r') as in_f:
+            
+            # Get the header from the first row
+            in_header = in_f.readline().lower().replace('\n', '').split(',')
+            
+            # Check for columns in input file
+            if 'sequence id' not in in_header and \
+                'order key' not in in_header and \
+                'downlink segment id' not in in_header and \
+                'image id' not in in_header and \
+                'record id' not in in_header and \
+                'recordid' not in in_header and \
+                'image info' not in in_header:
+                err_msg = '''The input file does not contain the proper columns.
   The input file must contain one of the following columns:
     Record ID
     recordId
@@ -215,36 +213,40 @@ class EODMS_CSV:
     Order Key
     Image Info
     A combination of Downlink Segment ID and Order Key'''
-            eod.print_support(err_msg)
-            sys.exit(1)
-        
-        # Populate the list of records from the input file
-        records = []
-        for l in in_lines[1:]:
-            rec = {}
-            l_split = l.replace('\n', '').split(',')
-            
-            if len(l_split) < len(in_header):
-                continue
+                self.eod.print_support(err_msg)
+                sys.exit(1)
             
-            for idx, h in enumerate(in_header):
-                prev_val = rec.get(h.lower())
-                if prev_val is None or prev_val == '':
-                    rec[h.lower()] = l_split[idx]
+            # Yield each record from the input file as it is read
+            for l in in_f:
+                rec = {}
+                l_split = l.replace('\n', '').split(',')
                 
-            coll_id = self.determine_collection(rec)
-            
-            if coll_id is None: continue
-            
-            rec['collectionId'] = coll_id
-            
-            # Add the record to the list of records
-            records.append(rec)
+                if len(l_split) < len(in_header):
+                    continue
+                
+                for idx, h in enumerate(in_header):
+                    prev_val = rec.get(h)
+                    if prev_val is None or prev_val == '':
+                        rec[h] = l_split[idx]
+                    
+                coll_id = self.determine_collection(rec)
+                
+                if coll_id is None: continue
+                
+                rec['collectionId'] = coll_id
+                
+                yield rec
         
-        # Close the input file
-        in_f.close()
+    def import_eodmsCSV(self):
         
-        return records
+        """
+        Imports the rows from the EODMS CSV file into a dictionary of records.
+        
+        :return: A list of records extracted from the CSV file.
+        :rtype: list
+        """
+        
+        return list(self.iter_eodmsCSV())
         
     def import_resCSV(self, in_fn):
         """
@@ -287,6 +289,25 @@ class EODMS_CSV:
             self.orders.update_order(order_item.get_orderId(), \
                 order_item)
         
+    def iter_csv(self):
+        """
+        Reads the rows from the CSV file one record at a time.
+        
+        :return: A generator of the records extracted from the CSV file.
+        :rtype: generator
+        """
+        
+        with open(self.csv_fn, 'r') as in_f:
+            reader = csv.reader(in_f)
+            header = next(reader, None)
+            if header is None: return
+            
+            for row in reader:
+                # Skip any blank lines in the file
+                if len(row) == 0: continue
+                
+                yield dict(zip(header, row))
+        
     def import_csv(self, required=[]):
         """
         Imports the rows from the CSV file into a dictionary of records.
@@ -295,18 +316,7 @@ class EODMS_CSV:
         :rtype: list
         """
         
-        reader = csv.reader(open(self.csv_fn, 'r'))
-        records = []
-        for idx, row in enumerate(reader):
-            if idx == 0:
-                header = row
-            else:
-                rec = {}
-                for i, c in enumerate(row):
-                    rec[header[i]] = c
-                records.append(rec)
-            
-        return records
+        return list(self.iter_csv())
         
     def close(self):
         """
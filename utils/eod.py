@@ -26,7 +26,8 @@
 
 import sys
 import os
-# import re
+import csv
+import re
 # import requests
 # import argparse
 # import traceback
@@ -38,21 +39,259 @@ import json
 import logging
 import logging.handlers as handlers
 # import pathlib
-
-from eodms_rapi import EODMSRAPI
-
-try:
-    import dateparser
-except:
-    msg = "Dateparser package is not installed. Please install and run script again."
-    common.print_support(msg)
-    logger.error(msg)
-    sys.exit(1)
+import threading
+import types
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from . import csv_util
 from . import image
 from . import geo
 
+_OPERATORS = ['=', '<', '>', '<>', '<=', '>=', ' LIKE ', ' STARTS WITH ', \
+            ' ENDS WITH ', ' CONTAINS ', ' CONTAINED BY ', ' CROSSES ', \
+            ' DISJOINT WITH ', ' INTERSECTS ', ' OVERLAPS ', ' TOUCHES ', \
+            ' WITHIN ']
+
+# Matches the first operator in a filter (longest operators first so that 
+#   '<=' is not matched as '<')
+_OP_RE = re.compile('|'.join(re.escape(o) for o in \
+            sorted(_OPERATORS, key=len, reverse=True)))
+
+# Matches each comma-separated filter in a list of filters
+_FILT_TOKEN_RE = re.compile(r'[^,]+')
+
+# Matches the filter ID before the operator of a filter
+_FILT_ID_RE = re.compile(r'\s*(.+?)\s*(?:%s)' % _OP_RE.pattern)
+
+# Matches a date entered by the user (YYYYMMDD or YYYYMMDDTHHMMSS)
+_DATE_RE = re.compile(r'(\d{4})(\d{2})(\d{2})(?:[tT](\d{2})(\d{2})(\d{2}))?')
+
+# Matches a range of dates entered by the user (<start>-<end>)
+_DATE_RANGE_RE = re.compile(r'\s*%s\s*-\s*%s\s*' % (_DATE_RE.pattern, \
+                    _DATE_RE.pattern))
+
+# Matches a time interval entered by the user (ex: 24 hours)
+_TIME_RE = re.compile(r'hour|day|week|month|year', re.I)
+
+# The characters which can start a JSON document
+_JSON_START = frozenset('{["-0123456789tfn')
+
+# The CSV columns which contain the Record ID of an image
+_ID_KEYS = frozenset(['sequence id', 'record id', 'recordid'])
+
+# Removes the quotes from a filter value
+_QUOTE_TBL = str.maketrans('', '', '"\'')
+
+# Converts a log time (YYYY-MM-DD HH:MM:SS) to a filename time (YYYYMMDD_HHMMSS)
+_FN_TBL = str.maketrans(' ', '_', '-:')
+
+# The position of the fields which are placed first in the results
+_FIELD_ORDER = {'recordId': 0, 'collectionId': 1, 'orderId': 2, 'itemId': 3}
+
+# The mapping of the field IDs used by the script to the RAPI field names
+_FIELD_MAP = {
+    'COSMO-SkyMed1':
+        {
+            'ORBIT_DIRECTION': 'Absolute Orbit', 
+            'PIXEL_SPACING': 'Spatial Resolution'
+        }, 
+    'DMC':
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Incidence Angle'
+        }, 
+    'Gaofen-1':
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
+        }, 
+    'GeoEye-1':
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'IKONOS': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'IRS': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'NAPL':
+        {
+            'COLOUR': 'Sensor Mode', 
+            'SCALE': 'Scale', 
+            'ROLL': 'Roll Number', 
+            'PHOTO_NUMBER': 'Photo Number' 
+            # 'PREVIEW_AVAILABLE': 'PREVIEW_AVAILABLE'
+        }, 
+    'PlanetScope': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
+        }, 
+    'QuickBird-2': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'RCMImageProducts': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction', 
+            # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            'BEAM_MNEMONIC': 'Beam Mnemonic', 
+            'BEAM_MODE_QUALIFIER': 'Beam Mode Qualifier', 
+            # 'BEAM_MODE_TYPE': 'RCM.SBEAM',
+            'DOWNLINK_SEGMENT_ID': 'Downlink Segment ID', 
+            'LUT_APPLIED': 'LUT Applied', 
+            'OPEN_DATA': 'Open Data', 
+            'POLARIZATION': 'Polarization', 
+            'PRODUCT_FORMAT': 'Product Format', 
+            'PRODUCT_TYPE': 'Product Type', 
+            'RELATIVE_ORBIT': 'Relative Orbit', 
+            'WITHIN_ORBIT_TUBE': 'Within Orbit Tube', 
+            'ORDER_KEY': 'Order Key', 
+            'SEQUENCE_ID': 'Sequence Id', 
+            'SPECIAL_HANDLING_REQUIRED': 'Special Handling Required'
+        }, 
+    'RCMScienceData': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            'BEAM_MODE': 'Beam Mode Type', 
+            'BEAM_MNEMONIC': 'Beam Mnemonic', 
+            'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
+            'RECEIVE POLARIZATION': 'Receive Polarization', 
+            'DOWNLINK_SEGMENT_ID': 'Downlink Segment ID'
+
+        }, 
+    'Radarsat1': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction',
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            # 'BEAM_MODE': 'RSAT1.SBEAM', 
+            'BEAM_MNEMONIC': 'Position', 
+            'ORBIT': 'Absolute Orbit'
+        }, 
+    'Radarsat1RawProducts': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction',
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            'DATASET_ID': 'Dataset Id', 
+            'ARCHIVE_FACILITY': 'Reception Facility', 
+            'RECEPTION FACILITY': 'Reception Facility', 
+            'BEAM_MODE': 'Sensor Mode', 
+            'BEAM_MNEMONIC': 'Position', 
+            'ABSOLUTE_ORBIT': 'Absolute Orbit'
+        }, 
+    'Radarsat2':
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            'SEQUENCE_ID': 'Sequence Id', 
+            # 'BEAM_MODE': 'RSAT2.SBEAM', 
+            'BEAM_MNEMONIC': 'Position', 
+            'LOOK_DIRECTION': 'Look Direction', 
+            'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
+            'RECEIVE_POLARIZATION': 'Receive Polarization', 
+            'IMAGE_ID': 'Image Id', 
+            'RELATIVE_ORBIT': 'Relative Orbit', 
+            'ORDER_KEY': 'Order Key'
+        }, 
+    'Radarsat2RawProducts': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Incidence Angle', 
+            'LOOK_ORIENTATION': 'Look Orientation', 
+            'BEAM_MODE': 'Sensor Mode', 
+            'BEAM_MNEMONIC': 'Position', 
+            'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
+            'RECEIVE_POLARIZATION': 'Receive Polarization', 
+            'IMAGE_ID': 'Image Id'
+        }, 
+    'RapidEye': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'SGBAirPhotos': 
+        {
+            'SCALE': 'Scale', 
+            'ROLL_NUMBER': 'Roll Number', 
+            'PHOTO_NUMBER': 'Photo Number', 
+            'AREA': 'Area'
+        }, 
+    'SPOT': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
+        }, 
+    'TerraSarX': 
+        {
+            'ORBIT_DIRECTION': 'Orbit Direction', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Incidence Angle'
+        }, 
+    'VASP': 
+        {
+            'VASP_OPTIONS': 'Sequence Id'
+        }, 
+    'WorldView-1': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'WorldView-2': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }, 
+    'WorldView-3': 
+        {
+            'CLOUD_COVER': 'Cloud Cover', 
+            'PIXEL_SPACING': 'Spatial Resolution', 
+            'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
+            'SENSOR_MODE': 'Sensor Mode'
+        }
+    }
+
+# get_fieldMap returns this shared mapping so it is made read-only
+_FIELD_MAP = types.MappingProxyType(_FIELD_MAP)
+
+# The filter IDs available for each collection
+_FIELD_KEYS = dict((coll_id, frozenset(fields)) for coll_id, fields in \
+                _FIELD_MAP.items())
+
 class Eodms_OrderDownload:
     
     def __init__(self, **kwargs):
@@ -75,10 +314,7 @@ class Eodms_OrderDownload:
         self.rapi_domain = 'https://www.eodms-sgdot.nrcan-rncan.gc.ca'
         self.indent = 3
 
-        self.operators = ['=', '<', '>', '<>', '<=', '>=', ' LIKE ', \
-                        ' STARTS WITH ', ' ENDS WITH ', ' CONTAINS ', \
-                        ' CONTAINED BY ', ' CROSSES ', ' DISJOINT WITH ', \
-                        ' INTERSECTS ', ' OVERLAPS ', ' TOUCHES ', ' WITHIN ']
+        self.operators = _OPERATORS
         
         self.username = kwargs.get('username')
         self.password = kwargs.get('password')
@@ -114,14 +350,53 @@ class Eodms_OrderDownload:
             self.silent = bool(kwargs.get('silent'))
         
         if self.username is not None and self.password is not None:
+            from eodms_rapi import EODMSRAPI
             self.eodms_rapi = EODMSRAPI(self.username, self.password)
         
         self.aoi_extensions = ['.gml', '.kml', '.json', '.geojson', '.shp']
+        self._aoi_ext_set = frozenset(self.aoi_extensions)
+        
+        # The download folder which has already been created
+        self._download_dir = None
         
         self.cur_res = None
         
+        self._collections = None
+        
+        # The maximum number of queries sent to the RAPI at the same time
+        self.max_workers = 5
+        self._thread_data = threading.local()
+        
+        # The pools of threads by number of workers, kept until the end of 
+        #   the process so each thread's EODMSRAPI instance is reused
+        self._executors = {}
+        
+        # The number of order items downloaded at the same time, which can 
+        #   be set with the EODMS_DL_WORKERS environment variable
+        try:
+            self.download_workers = int(os.environ.get('EODMS_DL_WORKERS', 8))
+        except ValueError:
+            self.download_workers = 8
+        
         self.email = 'eodms-sgdot@nrcan-rncan.gc.ca'
             
+    def _now_strs(self):
+        """
+        Gets the current time along with its formatted strings.
+        
+        :return: The current datetime, the time formatted for the log and 
+                the time formatted for filenames.
+        :rtype: tuple
+        """
+        
+        now = datetime.datetime.now()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Build the filename string (YYYYMMDD_HHMMSS) from the same string
+        fn_str = now_str.translate(_FN_TBL)
+        
+        return now, now_str, fn_str
+        
     def _parse_dates(self, in_dates):
         """
         Parses dates from the user into a format for the EODMSRAPI
@@ -139,31 +414,23 @@ class Eodms_OrderDownload:
         
         if in_dates is None or in_dates == '': return ''
             
-        time_words = ['hour', 'day', 'week', 'month', 'year']
-        
-        if any(word in in_dates for word in time_words):
+        if _TIME_RE.search(in_dates):
             # start = dateparser.parse(in_dates).strftime("%Y%m%d_%H%M%S")
             # end = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             dates = [in_dates]
         else:
         
             # Modify date for the EODMSRAPI object
-            date_ranges = in_dates.split(',')
-            
             dates = []
-            for rng in date_ranges:
-                start, end = rng.split('-')
-                if start.lower().find('t') > -1:
-                    start = start.lower().replace('t', '_')
-                else:
-                    start = '%s_000000' % start
-                    
-                if end.lower().find('t') > -1:
-                    end = end.lower().replace('t', '_')
-                else:
-                    end = '%s_000000' % end
+            for rng in in_dates.split(','):
+                m = _DATE_RANGE_RE.fullmatch(rng)
+                
+                if m is None:
+                    raise ValueError("Date range '%s' is not valid." % rng)
                 
-            dates.append({'start': start, 'end': end})
+                date_parts = m.groups('00')
+                dates.append({'start': '%s%s%s_%s%s%s' % date_parts[:6], \
+                            'end': '%s%s%s_%s%s%s' % date_parts[6:]})
             
         return dates
         
@@ -185,28 +452,27 @@ class Eodms_OrderDownload:
         
         out_filters = {}
         
+        if coll_id is None:
+            coll_id = self.coll_id
+        
+        coll_fields = self.get_fieldMap().get(coll_id, {})
+        
         for filt in filters:
             
             filt = filt.upper()
-                
-            if not any(x in filt for x in self.operators):
+            
+            m = _OP_RE.search(filt)
+            
+            if m is None:
                 print("Filter '%s' entered incorrectly." % filt)
                 continue
             
-            ops = [x for x in self.operators if x in filt]
-
-            for o in ops:
-                filt_split = filt.split(o)
-                op = o
+            op = m.group(0)
                 
-            if coll_id is None:
-                coll_id = self.coll_id
-            
             # Convert the input field for EODMS_RAPI
-            key = filt_split[0].strip()
-            coll_fields = self.get_fieldMap()[coll_id]
+            key = filt[:m.start()].strip()
             
-            if not key in coll_fields.keys():
+            if key not in coll_fields:
                 err = "Filter '%s' is not available for Collection '%s'." \
                         % (key, coll_id)
                 self.print_msg("WARNING: %s" % err)
@@ -215,8 +481,8 @@ class Eodms_OrderDownload:
                 
             field = coll_fields[key]
             
-            val = filt_split[1].strip()
-            val = val.replace('"', '').replace("'", '')
+            val = filt[m.end():].strip()
+            val = val.translate(_QUOTE_TBL)
             
             if val is None or val == '':
                 err = "No value specified for Filter ID '%s'." % key
@@ -241,118 +507,114 @@ class Eodms_OrderDownload:
         """
         
         eodms_csv = csv_util.EODMS_CSV(self, csv_fn)
-        csv_res = eodms_csv.import_eodmsCSV()
         
         ##################################################
         self.print_heading("Retrieving Record IDs for the list of " \
             "entries in the CSV file")
         ##################################################
         
-        # Group all records into different collections
-        coll_recs = {}
-        for rec in csv_res:
-            # Get the collection ID for the image
-            collection = rec.get('collectionId')
-            
-            rec_lst = []
-            if collection in coll_recs.keys():
-                rec_lst = coll_recs[collection]
-                
-            rec_lst.append(rec)
-            
-            coll_recs[collection] = rec_lst
+        # The rows of the CSV are read one at a time and grouped by 
+        #   collection. Each group of 25 IDs is sent to the RAPI as soon as 
+        #   it is full so the queries run while the rest of the file is read.
+        coll_ids = defaultdict(list)
+        full_ids = {}
+        key_futures = []
+        batch_futures = []
         
-        all_res = []
+        # Get the collections before the queries are sent so each thread's 
+        #   EODMSRAPI instance can be given them
+        self.get_collections()
         
-        for coll, recs in coll_recs.items():
+        executor = self._get_executor(self.max_workers)
+        
+        for rec in eodms_csv.iter_eodmsCSV():
             
-            coll_id = self.get_fullCollId(coll)
+            coll = rec.get('collectionId')
             
-            filters = {}
+            id_val = None
+            for k, v in rec.items():
+                if k.lower() in _ID_KEYS:
+                    # If the Sequence ID is in the image dictionary, 
+                    #   return it as the Record ID
+                    id_val = v
+                    break
             
-            for idx in range(0, len(recs), 25):
+            if id_val is None:
+                # If the Order Key is in the image dictionary,
+                #   use it to query the RAPI
                 
-                # Get the next 100 images
-                if len(recs) < idx + 25:
-                    sub_recs = recs[idx:]
-                else:
-                    sub_recs = recs[idx:25 + idx]
-                    
-                seq_ids = []
+                order_key = rec.get('order key')
                 
-                for rec in sub_recs:
-                    
-                    id_val = None
-                    for k in rec.keys():
-                        if k.lower() in ['sequence id', 'record id', \
-                            'recordid']:
-                            # If the Sequence ID is in the image dictionary, 
-                            #   return it as the Record ID
-                            id_val = rec.get(k)
-                    
-                    if id_val is None:
-                        # If the Order Key is in the image dictionary,
-                        #   use it to query the RAPI
-                        
-                        order_key = rec.get('order key')
-                        
-                        if order_key is None or order_key == '':
-                            msg = "Cannot determine record " \
-                                    "ID for Result Number '%s' in the CSV file. " \
-                                    "Skipping image." % rec.get('result number')
-                            self.print_msg("WARNING: %s" % msg)
-                            self.logger.warning(msg)
-                            continue
-                            
-                        f = {'Order Key': ('=', [order_key])}
-                        
-                        # Send a query to the EODMSRAPI object
-                        self.eodms_rapi.search(coll_id, f)
-                        
-                        res = self.eodms_rapi.get_results()
-                        
-                        if len(res) > 1:
-                            msg = "Cannot determine record " \
-                                    "ID for Result Number '%s' in the CSV file. " \
-                                    "Skipping image." % rec.get('result number')
-                            self.print_msg("WARNING: %s" % msg)
-                            self.logger.warning(msg)
-                            continue
-                        
-                        all_res += res
-                        
-                        continue
-                        
-                    seq_ids.append(id_val)
-                    
-                if len(seq_ids) == 0: continue
+                if order_key is None or order_key == '':
+                    msg = "Cannot determine record " \
+                            "ID for Result Number '%s' in the CSV file. " \
+                            "Skipping image." % rec.get('result number')
+                    self.print_msg("WARNING: %s" % msg)
+                    self.logger.warning(msg)
+                    continue
                 
-                filters['Sequence Id'] = ('=', seq_ids)
-                    
-                if coll == 'NAPL':
-                    filters['Price'] = ('=', True)
-                        
-                # Send a query to the EODMSRAPI object
-                self.eodms_rapi.search(coll, query=filters)
+                if coll not in full_ids:
+                    full_ids[coll] = self.get_fullCollId(coll)
                 
-                res = self.eodms_rapi.get_results()
+                f = {'Order Key': ('=', [order_key])}
                 
-                # If the results is a list, an error occurred
-                if res is None:
-                    self.print_msg("WARNING: %s" % ' '.join(res))
-                    self.logger.warning(' '.join(res))
-                    continue
+                key_futures.append((rec, executor.submit(\
+                    self._search_batch, full_ids[coll], f)))
                 
-                # If no results, return as error
-                if len(res) == 0:
-                    err = "No images could be found."
-                    common.print_msg("WARNING: %s" % err)
-                    self.logger.warning(err)
-                    common.print_msg("Skipping this entry", False)
-                    self.logger.warning("Skipping this entry")
-                    continue
-                
-                all_res += res
+                continue
+            
+            seq_ids = coll_ids[coll]
+            seq_ids.append(id_val)
+            
+            if len(seq_ids) < 25: continue
+            
+            batch_futures.append(executor.submit(self._search_batch, \
+                coll, self._get_seqFilters(coll, seq_ids)))
+            
+            del coll_ids[coll]
+        
+        # Send the remaining IDs of each collection
+        for coll, seq_ids in coll_ids.items():
+            batch_futures.append(executor.submit(self._search_batch, \
+                coll, self._get_seqFilters(coll, seq_ids)))
+        
+        all_res = []
+        
+        for rec, future in key_futures:
+            
+            res = future.result()
+            
+            if res is None or len(res) > 1:
+                msg = "Cannot determine record " \
+                        "ID for Result Number '%s' in the CSV file. " \
+                        "Skipping image." % rec.get('result number')
+                self.print_msg("WARNING: %s" % msg)
+                self.logger.warning(msg)
+                continue
+            
+            all_res += res
+        
+        for future in batch_futures:
+            
+            res = future.result()
+            
+            # If the results is None, an error occurred
+            if res is None:
+                err = "The query to the RAPI failed."
+                self.print_msg("WARNING: %s" % err)
+                self.logger.warning(err)
+                continue
+            
+            # If no results, return as error
+            if len(res) == 0:
+                err = "No images could be found."
+                self.print_msg("WARNING: %s" % err)
+                self.logger.warning(err)
+                self.print_msg("Skipping this entry", False)
+                self.logger.warning("Skipping this entry")
+                continue
+            
+            all_res += res
         
         # Convert results to ImageList
         self.results = image.ImageList(self)
@@ -362,24 +624,211 @@ class Eodms_OrderDownload:
         
     def _get_prevRes(self, csv_fn):
         """
-        Creates a EODMSRAPI instance.
+        Gets the images from a results CSV file of a previous session. The 
+            rows are read one at a time straight into the ImageList.
         
         :param csv_fn: The filename of the previous results CSV file.
         :type  csv_fn: str
         
-        :return: A list of rows from the CSV file.
-        :rtype: list
+        :return: An ImageList containing the images from the CSV file.
+        :rtype: image.ImageList
         """
         
         eodms_csv = csv_util.EODMS_CSV(self, csv_fn)
-        csv_res = eodms_csv.import_csv()
         
         # Convert results to ImageList
         query_imgs = image.ImageList(self)
-        query_imgs.ingest_results(csv_res, True)
+        query_imgs.ingest_results(eodms_csv.iter_csv(), True)
         
         return query_imgs
         
+    def _download_items(self, items, query_imgs):
+        """
+        Downloads a list of order items and updates the images with the 
+            download info. The items are split into groups which are 
+            downloaded at the same time, each by its own EODMSRAPI instance, 
+            and the images of each group are updated as soon as its 
+            download finishes.
+        
+        :param items: A list of order items in JSON format.
+        :type  items: list
+        :param query_imgs: The ImageList containing the images of the items.
+        :type  query_imgs: image.ImageList
+        
+        :return: A list of the order items after the download.
+        :rtype: list
+        """
+        
+        if items is None or len(items) < 2:
+            download_items = self.eodms_rapi.download(items, \
+                                self.download_path)
+            
+            # The EODMSRAPI returns None if there was nothing to download
+            if not download_items: return []
+            
+            query_imgs.update_downloads(download_items)
+            return download_items
+        
+        workers = max(1, min(self.download_workers, len(items)))
+        groups = [items[idx::workers] for idx in range(workers)]
+        
+        executor = self._get_executor(self.download_workers)
+        futures = [executor.submit(lambda g: self._get_threadRapi().\
+                    download(g, self.download_path), g) for g in groups]
+        
+        # Only the main thread updates the images
+        download_items = []
+        for future in as_completed(futures):
+            res = future.result()
+            
+            # The EODMSRAPI returns None if there was nothing to download
+            if not res: continue
+            
+            query_imgs.update_downloads(res)
+            download_items += res
+        
+        return download_items
+        
+    def _ensure_download_dir(self):
+        """
+        Creates the download folder if it doesn't exist. The folder is only 
+            checked once for each download path.
+        """
+        
+        if self._download_dir == self.download_path: return
+        
+        os.makedirs(self.download_path, exist_ok=True)
+        self._download_dir = self.download_path
+        
+    def _get_seqFilters(self, coll_id, seq_ids):
+        """
+        Builds the filters used to query a batch of Sequence IDs. A new 
+            dictionary is returned for each batch since the batches are 
+            sent to the RAPI at the same time.
+        
+        :param coll_id: The Collection ID of the images.
+        :type  coll_id: str
+        :param seq_ids: A list of Sequence IDs.
+        :type  seq_ids: list
+        
+        :return: The filters for the EODMSRAPI search.
+        :rtype: dict
+        """
+        
+        filters = {'Sequence Id': ('=', seq_ids)}
+        
+        if coll_id == 'NAPL':
+            filters['Price'] = ('=', True)
+        
+        return filters
+        
+    def _get_threadRapi(self):
+        """
+        Gets the EODMSRAPI instance for the current thread. Each worker 
+            thread has its own instance since the EODMSRAPI keeps the 
+            results of its last search.
+        
+        :return: The EODMSRAPI instance of the current thread.
+        :rtype: EODMSRAPI
+        """
+        
+        rapi = getattr(self._thread_data, 'eodms_rapi', None)
+        
+        if rapi is None:
+            from eodms_rapi import EODMSRAPI
+            rapi = EODMSRAPI(self.username, self.password)
+            
+            # Give the instance the collections already retrieved by the 
+            #   main instance so it doesn't request them from the RAPI again
+            if self.eodms_rapi.rapi_collections:
+                rapi.rapi_collections = dict(self.eodms_rapi.rapi_collections)
+            
+            self._thread_data.eodms_rapi = rapi
+            
+        return rapi
+        
+    def _get_executor(self, max_workers):
+        """
+        Gets the pool of threads with the given number of workers. The pool 
+            is created the first time it is needed and kept until 
+            _shutdown_threads is called.
+        
+        :param max_workers: The maximum number of threads of the pool.
+        :type  max_workers: int
+        
+        :return: The pool of threads.
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        
+        executor = self._executors.get(max_workers)
+        
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._executors[max_workers] = executor
+            
+        return executor
+        
+    def _shutdown_threads(self):
+        """
+        Shuts down the pools of threads along with the EODMSRAPI instances 
+            of their threads.
+        """
+        
+        for executor in self._executors.values():
+            executor.shutdown()
+        
+        self._executors = {}
+        self._thread_data = threading.local()
+        
+    def _run_threads(self, func, args, max_workers=None):
+        """
+        Runs a function on each item of a list using a pool of threads.
+        
+        :param func: The function to run for each item.
+        :type  func: function
+        :param args: A list of items passed to the function.
+        :type  args: list
+        :param max_workers: The maximum number of threads (the max_workers 
+                of the object if None).
+        :type  max_workers: int
+        
+        :return: A list of the function results, in the same order as 
+                the items.
+        :rtype: list
+        """
+        
+        if len(args) == 0: return []
+        
+        if max_workers is None:
+            max_workers = self.max_workers
+        
+        executor = self._get_executor(max_workers)
+        
+        return list(executor.map(func, args))
+        
+    def _search_batch(self, coll_id, filters, *args):
+        """
+        Sends a single query to the RAPI.
+        
+        :param coll_id: The Collection ID for the query.
+        :type  coll_id: str
+        :param filters: A dictionary of filters for the query.
+        :type  filters: dict
+        :param args: Any other arguments of the EODMSRAPI search (features, 
+                dates, result fields and maximum number of results).
+        :type  args: tuple
+        
+        :return: A list of results from the RAPI.
+        :rtype: list
+        """
+        
+        rapi = self._get_threadRapi()
+        
+        # Send a query to the EODMSRAPI object
+        rapi.search(coll_id, filters, *args)
+        
+        return rapi.get_results()
+        
     def _print_results(self, images):
         """
         Prints the results of image downloads.
@@ -397,28 +846,31 @@ class Eodms_OrderDownload:
             else:
                 failed_orders.append(img)
         
+        # The download report is sent to the log as a single record
+        report = []
+        
         if len(success_orders) > 0:
             # Print information for all successful orders
             #   including the download location
-            msg = "The following images have been downloaded:\n"
+            parts = ["The following images have been downloaded:\n"]
             for img in success_orders:
                 rec_id = img.get_recordId()
                 order_id = img.get_metadata('orderId')
                 orderitem_id = img.get_metadata('itemId')
                 dests = img.get_metadata('downloadPaths')
                 for d in dests:
-                    loc_dest = d['local_destination']
-                    src_url = d['url']
-                    msg += "\nRecord ID %s\n" % rec_id
-                    msg += "    Order Item ID: %s\n" % orderitem_id
-                    msg += "    Order ID: %s\n" % order_id
-                    msg += "    Downloaded File: %s\n" % loc_dest
-                    msg += "    Source URL: %s\n" % src_url
+                    parts.append("\nRecord ID %s\n" \
+                        "    Order Item ID: %s\n" \
+                        "    Order ID: %s\n" \
+                        "    Downloaded File: %s\n" \
+                        "    Source URL: %s\n" % (rec_id, orderitem_id, \
+                        order_id, d['local_destination'], d['url']))
+            msg = ''.join(parts)
             self.print_footer('Successful Downloads', msg)
-            self.logger.info("Successful Downloads: %s" % msg)
+            report.append("Successful Downloads: %s" % msg)
         
         if len(failed_orders) > 0:
-            msg = "The following images did not download:\n"
+            parts = ["The following images did not download:\n"]
             for img in failed_orders:
                 rec_id = img.get_recordId()
                 order_id = img.get_metadata('orderId')
@@ -426,13 +878,18 @@ class Eodms_OrderDownload:
                 status = img.get_metadata('status')
                 stat_msg = img.get_metadata('statusMessage')
                 
-                msg += "\nRecord ID %s\n" % rec_id
-                msg += "    Order Item ID: %s\n" % orderitem_id
-                msg += "    Order ID: %s\n" % order_id
-                msg += "    Status: %s\n" % status
-                msg += "    Status Message: %s\n" % stat_msg
+                parts.append("\nRecord ID %s\n" \
+                    "    Order Item ID: %s\n" \
+                    "    Order ID: %s\n" \
+                    "    Status: %s\n" \
+                    "    Status Message: %s\n" % (rec_id, orderitem_id, \
+                    order_id, status, stat_msg))
+            msg = ''.join(parts)
             self.print_footer('Failed Downloads', msg)
-            self.logger.info("Failed Downloads: %s" % msg)
+            report.append("Failed Downloads: %s" % msg)
+        
+        if len(report) > 0:
+            self.logger.info("%s", '\n'.join(report))
         
     def convert_date(self, in_date):
         """
@@ -445,20 +902,12 @@ class Eodms_OrderDownload:
         :rtype: str
         """
         
-        if in_date.lower().find('t') > -1:
-            date, tme = in_date.lower().split('t')
-            year = date[:4]
-            mth = date[4:6]
-            day = date[6:]
-            hour = tme[:2]
-            minute = tme[2:4]
-            sec = tme[4:]
-            out_date = '%s-%s-%sT%s:%s:%sZ' % (year, mth, day, hour, minute, sec)
-        else:
-            year = in_date[:4]
-            mth = in_date[4:6]
-            day = in_date[6:]
-            out_date = '%s-%s-%sT00:00:00Z' % (year, mth, day)
+        m = _DATE_RE.fullmatch(in_date.strip())
+        
+        if m is None:
+            raise ValueError("Date '%s' is not valid." % in_date)
+        
+        out_date = '%s-%s-%sT%s:%s:%sZ' % m.groups('00')
                     
         return out_date
         
@@ -474,7 +923,15 @@ class Eodms_OrderDownload:
         
         self.username = username
         self.password = password
+        
+        # The EODMSRAPI package is only imported once a session is needed 
+        #   to keep the start-up of the script fast
+        from eodms_rapi import EODMSRAPI
         self.eodms_rapi = EODMSRAPI(username, password)
+        self._collections = None
+        
+        # The threads' EODMSRAPI instances use the previous credentials
+        self._shutdown_threads()
         
     def export_results(self):
         """
@@ -506,20 +963,43 @@ class Eodms_OrderDownload:
         """
         
         # Write the values to the output CSV file
-        for rec in records:
-            out_vals = []
-            for h in header:
-                if h in rec.keys():
-                    val = str(rec[h])
-                    if val.find(',') > -1:
-                        val = '"%s"' % val
-                    out_vals.append(val)
-                else:
-                    out_vals.append('')
-                    
-            out_vals = [str(i) for i in out_vals]
-            csv_f.write('%s\n' % ','.join(out_vals))
+        writer = csv.writer(csv_f, lineterminator='\n')
+        writer.writerows([rec.get(h, '') for h in header] for rec in records)
+            
+    def get_collections(self):
+        """
+        Gets the collections available to the user. The collections are 
+            only retrieved from the RAPI once per session.
+        
+        :return: A dictionary of the collections from the RAPI or None if 
+                they couldn't be retrieved.
+        :rtype: dict
+        """
+        
+        if self._collections is None:
+            collections = self.eodms_rapi.get_collections()
             
+            # Nothing is kept if the collections couldn't be retrieved
+            if not isinstance(collections, dict): return None
+            
+            self._collections = collections
+            
+            # Index the collections by their lowercase ID and title
+            self._coll_lookup = {}
+            self._fullid_cache = {}
+            for k, v in self._collections.items():
+                self._coll_lookup[v['title'].lower()] = k
+                self._coll_lookup[k.lower()] = k
+            
+            # All the lowercase names (IDs, titles and aliases) which are 
+            #   accepted for a collection
+            coll_names = set(self._coll_lookup.keys())
+            for v in self._collections.values():
+                coll_names.update(a.lower() for a in v.get('aliases', []))
+            self._coll_names = frozenset(coll_names)
+            
+        return self._collections
+        
     def get_collIdByName(self, in_title): #, unsupported=False):
         """
         Gets the Collection ID based on the tile/name of the collection.
@@ -534,7 +1014,13 @@ class Eodms_OrderDownload:
         if isinstance(in_title, list):
             in_title = in_title[0]
         
-        for k, v in self.eodms_rapi.get_collections().items():
+        collections = self.get_collections()
+        
+        coll_id = self._coll_lookup.get(in_title.lower())
+        if coll_id is not None:
+            return coll_id
+        
+        for k, v in collections.items():
             if v['title'].find(in_title) > -1:
                 return k
                 
@@ -552,10 +1038,24 @@ class Eodms_OrderDownload:
         :rtype: str
         """
         
-        collections = self.eodms_rapi.get_collections()
-        for k, v in collections.items():
-            if k.find(coll_id) > -1 or v['title'].find(coll_id) > -1:
-                return k
+        collections = self.get_collections()
+        
+        if coll_id in self._fullid_cache:
+            return self._fullid_cache[coll_id]
+        
+        full_id = self._coll_lookup.get(coll_id.lower())
+        
+        if full_id is None:
+            # Otherwise, check if the value is part of a collection ID or 
+            #   title
+            for k, v in collections.items():
+                if k.find(coll_id) > -1 or v['title'].find(coll_id) > -1:
+                    full_id = k
+                    break
+        
+        self._fullid_cache[coll_id] = full_id
+        
+        return full_id
                 
     def retrieve_orders(self, query_imgs):
         """
@@ -570,8 +1070,21 @@ class Eodms_OrderDownload:
         
         json_res = query_imgs.get_raw()
         
-        # Get existing orders of the images
-        order_res = self.eodms_rapi.get_ordersByRecords(json_res)
+        # Get existing orders of the images, 100 records at a time
+        chunks = [json_res[idx:idx + 100] for idx in \
+                    range(0, len(json_res), 100)]
+        if len(chunks) < 2:
+            # A single lookup doesn't need a thread of its own
+            chunk_res = [self.eodms_rapi.get_ordersByRecords(c) \
+                        for c in chunks]
+        else:
+            chunk_res = self._run_threads(lambda c: self._get_threadRapi().\
+                        get_ordersByRecords(c), chunks)
+        
+        order_res = []
+        for res in chunk_res:
+            if res is not None:
+                order_res += res
         
         # Convert results to an OrderList
         orders = image.OrderList(self, query_imgs)
@@ -593,7 +1106,7 @@ class Eodms_OrderDownload:
                 msg = "\nNo existing orders could be found for the given AOI. " \
                         "Would you like to order the images? (y/n): "
                 answer = input(msg)
-                if answer.lower().find('y') > -1:
+                if answer[:1].lower() == 'y':
                     order_res = self.eodms_rapi.order(json_res)
                 else:
                     # Export polygons of images
@@ -622,8 +1135,19 @@ class Eodms_OrderDownload:
         :return: True if the input string is in valid JSON format, False if not.
         :rtype: boolean
         """
+        
+        if not isinstance(my_json, (str, bytes)) or len(my_json) == 0:
+            return False
+        
+        # Reject values which cannot start a JSON document without parsing
+        first = my_json.lstrip()[:1]
+        if isinstance(first, bytes):
+            first = first.decode('latin-1')
+        if first not in _JSON_START:
+            return False
+        
         try:
-            json_object = json.loads(my_json)
+            json.loads(my_json)
         except (ValueError, TypeError) as e:
             return False
         return True
@@ -639,18 +1163,12 @@ class Eodms_OrderDownload:
         :rtype: list
         """
         
-        field_order = ['recordId', 'collectionId']
-        
-        if 'orderId' in fields: field_order.append('orderId')
-        if 'itemId' in fields: field_order.append('itemId')
+        # The recordId and collectionId are always included
+        out_fields = set(fields)
+        out_fields.update(['recordId', 'collectionId'])
         
-        out_fields = field_order
-        
-        for f in fields:
-            if f not in field_order:
-                out_fields.append(f)
-        
-        return out_fields
+        return sorted(out_fields, key=lambda f: \
+                (_FIELD_ORDER.get(f, len(_FIELD_ORDER)), f))
         
     def parse_max(self, maximum):
         """
@@ -693,6 +1211,8 @@ class Eodms_OrderDownload:
         :type  indent: str
         """
         
+        if self.silent: return
+        
         indent_str = ''
         if indent:
             indent_str = ' '*self.indent
@@ -701,6 +1221,21 @@ class Eodms_OrderDownload:
         
         print(msg)
         
+    def _fatal(self, err_msg, code=1):
+        """
+        Logs and prints an error message and exits the script.
+        
+        :param err_msg: The error message.
+        :type  err_msg: str
+        :param code: The exit code of the script.
+        :type  code: int
+        """
+        
+        self.logger.error(err_msg)
+        self.print_support(err_msg)
+        sys.stdout.flush()
+        sys.exit(code)
+        
     def print_footer(self, title, msg):
         """
         Prints a footer to the command prompt.
@@ -711,6 +1246,8 @@ class Eodms_OrderDownload:
         :type  msg: str
         """
         
+        if self.silent: return
+        
         print("\n%s-----%s%s" % (' '*self.indent, title, str((59 - len(title))*'-')))
         msg = msg.strip('\n')
         for m in msg.split('\n'):
@@ -726,6 +1263,8 @@ class Eodms_OrderDownload:
         :type  msg: str
         """
         
+        if self.silent: return
+        
         print("\n**************************************************************" \
                 "************")
         print(" %s" % msg)
@@ -741,6 +1280,7 @@ class Eodms_OrderDownload:
         """
         
         if err_str is None:
+            if self.silent: return
             print("\nIf you have any questions or require support, " \
                     "please contact the EODMS Support Team at " \
                     "%s" % self.email)
@@ -760,200 +1300,7 @@ class Eodms_OrderDownload:
         :rtype: dict
         """
         
-        return {
-            'COSMO-SkyMed1':
-                {
-                    'ORBIT_DIRECTION': 'Absolute Orbit', 
-                    'PIXEL_SPACING': 'Spatial Resolution'
-                }, 
-            'DMC':
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle'
-                }, 
-            'Gaofen-1':
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
-                }, 
-            'GeoEye-1':
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'IKONOS': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'IRS': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'NAPL':
-                {
-                    'COLOUR': 'Sensor Mode', 
-                    'SCALE': 'Scale', 
-                    'ROLL': 'Roll Number', 
-                    'PHOTO_NUMBER': 'Photo Number' 
-                    # 'PREVIEW_AVAILABLE': 'PREVIEW_AVAILABLE'
-                }, 
-            'PlanetScope': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
-                }, 
-            'QuickBird-2': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'RCMImageProducts': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction', 
-                    # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    'BEAM_MNEMONIC': 'Beam Mnemonic', 
-                    'BEAM_MODE_QUALIFIER': 'Beam Mode Qualifier', 
-                    # 'BEAM_MODE_TYPE': 'RCM.SBEAM',
-                    'DOWNLINK_SEGMENT_ID': 'Downlink Segment ID', 
-                    'LUT_APPLIED': 'LUT Applied', 
-                    'OPEN_DATA': 'Open Data', 
-                    'POLARIZATION': 'Polarization', 
-                    'PRODUCT_FORMAT': 'Product Format', 
-                    'PRODUCT_TYPE': 'Product Type', 
-                    'RELATIVE_ORBIT': 'Relative Orbit', 
-                    'WITHIN_ORBIT_TUBE': 'Within Orbit Tube', 
-                    'ORDER_KEY': 'Order Key', 
-                    'SEQUENCE_ID': 'Sequence Id', 
-                    'SPECIAL_HANDLING_REQUIRED': 'Special Handling Required'
-                }, 
-            'RCMScienceData': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    'BEAM_MODE': 'Beam Mode Type', 
-                    'BEAM_MNEMONIC': 'Beam Mnemonic', 
-                    'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
-                    'RECEIVE POLARIZATION': 'Receive Polarization', 
-                    'DOWNLINK_SEGMENT_ID': 'Downlink Segment ID'
-
-                }, 
-            'Radarsat1': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction',
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    # 'BEAM_MODE': 'RSAT1.SBEAM', 
-                    'BEAM_MNEMONIC': 'Position', 
-                    'ORBIT': 'Absolute Orbit'
-                }, 
-            'Radarsat1RawProducts': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction',
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    'DATASET_ID': 'Dataset Id', 
-                    'ARCHIVE_FACILITY': 'Reception Facility', 
-                    'RECEPTION FACILITY': 'Reception Facility', 
-                    'BEAM_MODE': 'Sensor Mode', 
-                    'BEAM_MNEMONIC': 'Position', 
-                    'ABSOLUTE_ORBIT': 'Absolute Orbit'
-                }, 
-            'Radarsat2':
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    # 'INCIDENCE_ANGLE': 'SENSOR_BEAM_CONFIG.INCIDENCE_LOW,SENSOR_BEAM_CONFIG.INCIDENCE_HIGH', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    'SEQUENCE_ID': 'Sequence Id', 
-                    # 'BEAM_MODE': 'RSAT2.SBEAM', 
-                    'BEAM_MNEMONIC': 'Position', 
-                    'LOOK_DIRECTION': 'Look Direction', 
-                    'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
-                    'RECEIVE_POLARIZATION': 'Receive Polarization', 
-                    'IMAGE_ID': 'Image Id', 
-                    'RELATIVE_ORBIT': 'Relative Orbit', 
-                    'ORDER_KEY': 'Order Key'
-                }, 
-            'Radarsat2RawProducts': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle', 
-                    'LOOK_ORIENTATION': 'Look Orientation', 
-                    'BEAM_MODE': 'Sensor Mode', 
-                    'BEAM_MNEMONIC': 'Position', 
-                    'TRANSMIT_POLARIZATION': 'Transmit Polarization', 
-                    'RECEIVE_POLARIZATION': 'Receive Polarization', 
-                    'IMAGE_ID': 'Image Id'
-                }, 
-            'RapidEye': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'SGBAirPhotos': 
-                {
-                    'SCALE': 'Scale', 
-                    'ROLL_NUMBER': 'Roll Number', 
-                    'PHOTO_NUMBER': 'Photo Number', 
-                    'AREA': 'Area'
-                }, 
-            'SPOT': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle'
-                }, 
-            'TerraSarX': 
-                {
-                    'ORBIT_DIRECTION': 'Orbit Direction', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Incidence Angle'
-                }, 
-            'VASP': 
-                {
-                    'VASP_OPTIONS': 'Sequence Id'
-                }, 
-            'WorldView-1': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'WorldView-2': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }, 
-            'WorldView-3': 
-                {
-                    'CLOUD_COVER': 'Cloud Cover', 
-                    'PIXEL_SPACING': 'Spatial Resolution', 
-                    'INCIDENCE_ANGLE': 'Sensor Incidence Angle', 
-                    'SENSOR_MODE': 'Sensor Mode'
-                }
-            }
+        return _FIELD_MAP
     
     def query_entries(self, collections, **kwargs):
         """
@@ -982,47 +1329,50 @@ class Eodms_OrderDownload:
         
         feats = [('INTERSECTS', aoi)]
         
-        all_res = []
+        # Parse the filters of each collection once
+        parsed_filters = {}
+        if filters:
+            for coll_id, coll_filts in filters.items():
+                parsed_filters[coll_id] = self._parse_filters(coll_filts, \
+                                            coll_id)
+        
+        # Build the list of queries first so they can be sent to the RAPI 
+        #   concurrently
+        queries = []
+        coll_ids = set()
         for coll in collections:
             
             # Get the full Collection ID
             self.coll_id = self.get_fullCollId(coll)
             
-            # Parse filters
-            if filters:
-                if self.coll_id in filters.keys():
-                    coll_filts = filters[self.coll_id]
-                    filters = self._parse_filters(coll_filts)
-                    if isinstance(filters, str):
-                        filters = None
-                else:
-                    filters = None
-            else:
-                filters = None
+            # Skip any collection which has already been queried
+            if self.coll_id in coll_ids: continue
+            coll_ids.add(self.coll_id)
+            
+            # Get the parsed filters of this collection
+            coll_filters = parsed_filters.get(self.coll_id)
                 
             if self.coll_id == 'NAPL':
-                filters = {}
-                filters['Price'] = ('=', True)
-                
-            # print("filters: %s" % filters)
-            # answer = input("Press enter...")
+                coll_filters = {}
+                coll_filters['Price'] = ('=', True)
             
             result_fields = []
-            if filters is not None:
-                result_fields = list(filters.keys())
-            
-            # Send a query to the EODMSRAPI object
-            self.eodms_rapi.search(self.coll_id, filters, feats, dates, \
-                result_fields, max_images)
+            if coll_filters is not None:
+                result_fields = list(coll_filters.keys())
             
-            res = self.eodms_rapi.get_results()
-            
-            # Add this collection's results to all results
-            all_res += res
-            
-        # Convert results to ImageList
+            queries.append((self.coll_id, coll_filters, feats, dates, \
+                result_fields, max_images))
+        
+        # Send the queries to the EODMSRAPI
+        query_res = self._run_threads(lambda q: self._search_batch(*q), \
+                        queries)
+        
+        # Convert the results of each collection to an ImageList
         query_imgs = image.ImageList(self)
-        query_imgs.ingest_results(all_res)
+        for res in query_res:
+            # Skip any query which failed or returned no images
+            if not res: continue
+            query_imgs.ingest_results(res)
         
         return query_imgs
     
@@ -1051,10 +1401,22 @@ class Eodms_OrderDownload:
         
         if title is None: title = "Script Parameters"
         
-        msg = "%s:\n" % title
-        for k, v in params.items():
-            msg += "  %s: %s\n" % (k, v)
-        self.logger.info(msg)
+        parts = ["%s:" % title]
+        parts.extend("  %s: %s" % (k, v) for k, v in params.items())
+        self.logger.info("%s\n", '\n'.join(parts))
+        
+    def set_downloadWorkers(self, workers):
+        """
+        Sets the number of images downloaded at the same time.
+        
+        :param workers: The number of download workers.
+        :type  workers: str or int
+        """
+        
+        try:
+            self.download_workers = max(1, int(workers))
+        except ValueError:
+            self.download_workers = 8
         
     def set_silence(self, silent):
         """
@@ -1077,20 +1439,9 @@ class Eodms_OrderDownload:
         :rtype: str or boolean
         """
         
-        colls = self.eodms_rapi.get_collections()
+        self.get_collections()
         
-        aliases = [v['aliases'] for v in colls.values()]
-        
-        coll_vals = list(colls.keys()) + [v['title'] for v in \
-                    colls.values()]
-        
-        for a in aliases:
-            coll_vals += a
-        
-        if coll.lower() in [c.lower() for c in coll_vals]:
-            return True
-            
-        return False
+        return coll.lower() in self._coll_names
         
     def validate_dates(self, dates):
         """
@@ -1103,11 +1454,14 @@ class Eodms_OrderDownload:
         :rtype: str or boolean
         """
         
-        try:
-            self._parse_dates(dates)
+        if dates is None or dates == '' or _TIME_RE.search(dates):
             return dates
-        except:
-            return False
+        
+        for rng in dates.split(','):
+            if not _DATE_RANGE_RE.fullmatch(rng):
+                return False
+        
+        return dates
         
     def validate_int(self, val, limit=None):
         """
@@ -1129,16 +1483,17 @@ class Eodms_OrderDownload:
                 val = int(val)
             
             if isinstance(val, list):
-                if limit is not None:
-                    if any(int(v) > limit for v in val):
+                # Convert and check each value in a single pass
+                out_val = []
+                for v in val:
+                    int_val = int(v)
+                    if limit is not None and int_val > limit:
                         err_msg = "WARNING: One of the values entered is " \
                             "invalid."
                         self.print_msg(err_msg, indent=False)
                         self.logger.warning(err_msg)
                         return False
-                    out_val = [int(v) for v in val]
-                else:
-                    out_val = int(val)
+                    out_val.append(int_val)
             else:
                 if limit is not None:
                     if int(val) > limit:
@@ -1170,10 +1525,9 @@ class Eodms_OrderDownload:
         :rtype: str or boolean
         """
         
-        abs_path = os.path.abspath(in_fn)
-        
         if aoi:
-            if not any(s in in_fn for s in self.aoi_extensions):
+            ext = os.path.splitext(in_fn)[1].lower()
+            if ext not in self._aoi_ext_set:
                 err_msg = "The AOI file is not a valid file. Please make " \
                             "sure the file is either a GML, KML, GeoJSON " \
                             "or Shapefile."
@@ -1181,13 +1535,13 @@ class Eodms_OrderDownload:
                 self.logger.error(err_msg)
                 return False
         
-            if not os.path.exists(abs_path):
+        abs_path = os.path.abspath(in_fn)
+        
+        if not os.path.exists(abs_path):
+            if aoi:
                 err_msg = "The AOI file does not exist."
                 self.print_support(err_msg)
                 self.logger.error(err_msg)
-                return False
-                
-        if not os.path.exists(abs_path):
             return False
             
         return abs_path
@@ -1205,8 +1559,10 @@ class Eodms_OrderDownload:
         :rtype: boolean or str
         """
         
+        filt_upper = filt_items.upper()
+        
         # Check if filter has proper operators
-        if not any(x in filt_items.upper() for x in self.operators):
+        if _OP_RE.search(filt_upper) is None:
             err_msg = "Filter(s) entered incorrectly. Make sure each " \
                         "filter is in the format of <filter_id><operator>" \
                         "<value>[|<value>] and each filter is separated by " \
@@ -1216,11 +1572,12 @@ class Eodms_OrderDownload:
             return False
             
         # Check if filter name is valid
-        coll_fields = self.get_fieldMap()[coll_id]
-        filts = filt_items.split(',')
+        coll_keys = _FIELD_KEYS.get(coll_id, frozenset())
         
-        for f in filts:
-            if not any(x in f.upper() for x in coll_fields.keys()):
+        for token in _FILT_TOKEN_RE.finditer(filt_upper):
+            m = _FILT_ID_RE.match(token.group(0))
+            if m is None or m.group(1) not in coll_keys:
+                f = filt_items[token.start():token.end()]
                 err_msg = "Filter '%s' is not available for collection " \
                             "'%s'." % (f, coll_id)
                 self.print_support(err_msg)
@@ -1259,12 +1616,13 @@ class Eodms_OrderDownload:
             self.logger.error(err_msg)
             sys.exit(1)
             
+        # Make the download folder for the process
+        self._ensure_download_dir()
+        
         # Create info folder, if it doesn't exist, to store CSV files
-        start_time = datetime.datetime.now()
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-        self.fn_str = start_time.strftime("%Y%m%d_%H%M%S")
+        start_time, start_str, self.fn_str = self._now_strs()
         
-        self.logger.info("Process start time: %s" % start_str)
+        self.logger.info("Process start time: %s", start_str)
         
         #############################################
         # Search for Images
@@ -1308,7 +1666,7 @@ class Eodms_OrderDownload:
                 answer = input("\n%s images found intersecting your AOI. " \
                             "Proceed with ordering? (y/n): " % \
                             query_imgs.count())
-                if answer.lower().find('n') > -1:
+                if answer[:1].lower() == 'n':
                     self.export_results()
                     print("Exiting process.")
                     self.print_support()
@@ -1337,20 +1695,21 @@ class Eodms_OrderDownload:
         orders = image.OrderList(self, query_imgs)
         
         # Send orders to the RAPI
-        if max_items is None or max_items == 0:
+        if max_items is None or max_items == 0 or len(json_res) <= max_items:
             # Order all images in a single order
             order_res = self.eodms_rapi.order(json_res, priority)
             orders.ingest_results(order_res)
         else:
-            # Divide the images into the specified number of images per order
-            for idx in range(0, len(json_res), max_items):
-                # Get the next 100 images
-                if len(json_res) < idx + max_items:
-                    sub_recs = json_res[idx:]
-                else:
-                    sub_recs = json_res[idx:max_items + idx]
-                    
-                order_res = self.eodms_rapi.order(sub_recs, priority)
+            # Divide the images into the specified number of images per 
+            #   order and submit the orders at the same time, using the 
+            #   threads (and EODMSRAPI instances) kept for the process
+            chunks = [json_res[idx:idx + max_items] for idx in \
+                        range(0, len(json_res), max_items)]
+            
+            order_results = self._run_threads(lambda c: \
+                self._get_threadRapi().order(c, priority), chunks)
+            
+            for order_res in order_results:
                 orders.ingest_results(order_res)
                 
         # Update the self.cur_res for output results
@@ -1359,10 +1718,7 @@ class Eodms_OrderDownload:
         if orders.count_items() == 0:
             # If no orders could be found
             self.export_results()
-            err_msg = "No orders were submitted successfully."
-            self.print_support(err_msg)
-            self.logger.error(err_msg)
-            sys.exit(1)
+            self._fatal("No orders were submitted successfully.")
         
         #############################################
         # Download Images
@@ -1371,15 +1727,9 @@ class Eodms_OrderDownload:
         # Get a list of order items in JSON format for the EODMSRAPI
         items = orders.get_raw()
         
-        # Make the download folder if it doesn't exist
-        if not os.path.exists(self.download_path):
-            os.mkdir(self.download_path)
-        
-        # Download images using the EODMSRAPI
-        download_items = self.eodms_rapi.download(items, self.download_path)
-        
-        # Update the images with the download info
-        query_imgs.update_downloads(download_items)
+        # Download images using the EODMSRAPI and update them with the 
+        #   download info
+        self._download_items(items, query_imgs)
         
         self._print_results(query_imgs)
         
@@ -1391,10 +1741,12 @@ class Eodms_OrderDownload:
         
         self.export_results()
         
-        end_time = datetime.datetime.now()
-        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
+        self._shutdown_threads()
         
-        self.logger.info("End time: %s" % end_str)
+        end_time, end_str, _ = self._now_strs()
+        
+        self.logger.info("End time: %s (elapsed time: %.1f seconds)", \
+            end_str, (end_time - start_time).total_seconds())
         
     def order_csv(self, params):
         """
@@ -1412,26 +1764,23 @@ class Eodms_OrderDownload:
         # Log the parameters
         self.log_parameters(params)
         
-        if csv_fn.find('.csv') == -1:
-            err_msg = "The provided input file is not a CSV file. " \
-                        "Exiting process."
-            self.print_support(err_msg)
-            self.logger.error(err_msg)
-            sys.exit(1)
+        if not csv_fn.lower().endswith('.csv'):
+            self._fatal("The provided input file is not a CSV file. " \
+                        "Exiting process.")
+        
+        # Make the download folder for the process
+        self._ensure_download_dir()
         
         # Create info folder, if it doesn't exist, to store CSV files
-        start_time = datetime.datetime.now()
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-        self.fn_str = start_time.strftime("%Y%m%d_%H%M%S")
-        folder_str = start_time.strftime("%Y-%m-%d")
+        start_time, start_str, self.fn_str = self._now_strs()
         
-        self.logger.info("Process start time: %s" % start_str)
+        self.logger.info("Process start time: %s", start_str)
         
         #############################################
         # Search for Images
         #############################################
         
-        self.eodms_rapi.get_collections()
+        self.get_collections()
         
         # Parse the maximum number of orders and items per order
         max_images, max_items = self.parse_max(maximum)
@@ -1461,10 +1810,7 @@ class Eodms_OrderDownload:
         if orders.count_items() == 0:
             # If no orders could be found
             self.export_results()
-            err_msg = "No orders were submitted successfully."
-            self.print_support(err_msg)
-            self.logger.error(err_msg)
-            sys.exit(1)
+            self._fatal("No orders were submitted successfully.")
         
         # Get a list of order items in JSON format for the EODMSRAPI
         items = orders.get_raw()
@@ -1473,15 +1819,9 @@ class Eodms_OrderDownload:
         # Download Images
         #############################################
         
-        # Make the download folder if it doesn't exist
-        if not os.path.exists(self.download_path):
-            os.mkdir(self.download_path)
-        
-        # Download images using the EODMSRAPI
-        download_items = self.eodms_rapi.download(items, self.download_path)
-        
-        # Update images
-        query_imgs.update_downloads(download_items)
+        # Download images using the EODMSRAPI and update them with the 
+        #   download info
+        self._download_items(items, query_imgs)
         
         # Export polygons of images
         eodms_geo = geo.Geo()
@@ -1491,10 +1831,12 @@ class Eodms_OrderDownload:
         self.cur_res = query_imgs
         self.export_results()
         
-        end_time = datetime.datetime.now()
-        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
+        self._shutdown_threads()
+        
+        end_time, end_str, _ = self._now_strs()
         
-        self.logger.info("End time: %s" % end_str)
+        self.logger.info("End time: %s (elapsed time: %.1f seconds)", \
+            end_str, (end_time - start_time).total_seconds())
         
     def download_aoi(self, params):
         """
@@ -1526,12 +1868,13 @@ class Eodms_OrderDownload:
             self.logger.error(err_msg)
             sys.exit(1)
             
+        # Make the download folder for the process
+        self._ensure_download_dir()
+        
         # Create info folder, if it doesn't exist, to store CSV files
-        start_time = datetime.datetime.now()
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-        self.fn_str = start_time.strftime("%Y%m%d_%H%M%S")
+        start_time, start_str, self.fn_str = self._now_strs()
         
-        self.logger.info("Process start time: %s" % start_str)
+        self.logger.info("Process start time: %s", start_str)
         
         #############################################
         # Search for Images
@@ -1581,15 +1924,9 @@ class Eodms_OrderDownload:
         # Get a list of order items in JSON format for the EODMSRAPI
         items = orders.get_raw()
         
-        # Make the download folder if it doesn't exist
-        if not os.path.exists(self.download_path):
-            os.mkdir(self.download_path)
-        
-        # Download images using the EODMSRAPI
-        download_items = self.eodms_rapi.download(items, self.download_path)
-        
-        # Update images with download info
-        query_imgs.update_downloads(download_items)
+        # Download images using the EODMSRAPI and update them with the 
+        #   download info
+        self._download_items(items, query_imgs)
         
         self._print_results(query_imgs)
         
@@ -1601,10 +1938,12 @@ class Eodms_OrderDownload:
         self.cur_res = query_imgs
         self.export_results()
         
-        end_time = datetime.datetime.now()
-        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
+        self._shutdown_threads()
+        
+        end_time, end_str, _ = self._now_strs()
         
-        self.logger.info("End time: %s" % end_str)
+        self.logger.info("End time: %s (elapsed time: %.1f seconds)", \
+            end_str, (end_time - start_time).total_seconds())
         
     def download_only(self, params):
         """
@@ -1620,20 +1959,17 @@ class Eodms_OrderDownload:
         csv_fn = params.get('input')
         self.output = params.get('output')
         
-        if csv_fn.find('.csv') == -1:
-            msg = "The provided input file is not a CSV file. " \
-                "Exiting process."
-            self.print_support(msg)
-            self.logger.error(msg)
-            sys.exit(1)
+        if not csv_fn.lower().endswith('.csv'):
+            self._fatal("The provided input file is not a CSV file. " \
+                "Exiting process.")
+        
+        # Make the download folder for the process
+        self._ensure_download_dir()
         
         # Create info folder, if it doesn't exist, to store CSV files
-        start_time = datetime.datetime.now()
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-        self.fn_str = start_time.strftime("%Y%m%d_%H%M%S")
-        folder_str = start_time.strftime("%Y-%m-%d")
+        start_time, start_str, self.fn_str = self._now_strs()
         
-        self.logger.info("Process start time: %s" % start_str)
+        self.logger.info("Process start time: %s", start_str)
         
         ################################################
         # Get results from Results CSV
@@ -1654,15 +1990,9 @@ class Eodms_OrderDownload:
         # Get a list of order items in JSON format for the EODMSRAPI
         items = orders.get_raw()
         
-        # Make the download folder if it doesn't exist
-        if not os.path.exists(self.download_path):
-            os.mkdir(self.download_path)
-        
-        # Download images using the EODMSRAPI
-        download_items = self.eodms_rapi.download(items, self.download_path)
-        
-        # Update images with download info
-        query_imgs.update_downloads(download_items)
+        # Download images using the EODMSRAPI and update them with the 
+        #   download info
+        self._download_items(items, query_imgs)
         
         self._print_results(query_imgs)
         
@@ -1672,10 +2002,12 @@ class Eodms_OrderDownload:
         
         self.export_results()
         
-        end_time = datetime.datetime.now()
-        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
+        self._shutdown_threads()
         
-        self.logger.info("End time: %s" % end_str)
+        end_time, end_str, _ = self._now_strs()
+        
+        self.logger.info("End time: %s (elapsed time: %.1f seconds)", \
+            end_str, (end_time - start_time).total_seconds())
         
     def search_only(self, params):
         """
@@ -1708,11 +2040,9 @@ class Eodms_OrderDownload:
             sys.exit(1)
             
         # Create info folder, if it doesn't exist, to store CSV files
-        start_time = datetime.datetime.now()
-        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-        self.fn_str = start_time.strftime("%Y%m%d_%H%M%S")
+        start_time, start_str, self.fn_str = self._now_strs()
         
-        self.logger.info("Process start time: %s" % start_str)
+        self.logger.info("Process start time: %s", start_str)
         
         #############################################
         # Search for Images
@@ -1761,5 +2091,7 @@ class Eodms_OrderDownload:
         print("\nPlease check the results folder for more info.")
         print("\nExiting process.")
         
+        self._shutdown_threads()
+        
         self.print_support()
         sys.exit(0)
@@ -29,19 +29,42 @@ import sys
 from xml.etree import ElementTree
 import json
 import logging
-try:
-    import ogr
-    import osr
-    GDAL_INCLUDED = True
-except ImportError:
-    # print("error with gdal import")
+
+# GDAL is only imported the first time a geographic process needs it
+ogr = None
+osr = None
+GDAL_INCLUDED = None
+
+def _load_gdal():
+    """
+    Imports the OGR and OSR modules of GDAL, if not already imported.
+    
+    :return: True if GDAL is installed, False if not.
+    :rtype: boolean
+    """
+    
+    global ogr, osr, GDAL_INCLUDED
+    
+    if GDAL_INCLUDED is not None: return GDAL_INCLUDED
+    
     try:
-        import osgeo.ogr as ogr
-        import osgeo.osr as osr
-        GDAL_INCLUDED = True
+        import ogr as ogr_mod
+        import osr as osr_mod
     except ImportError:
-        # print("error with osgeo gdal import")
-        GDAL_INCLUDED = False
+        # print("error with gdal import")
+        try:
+            import osgeo.ogr as ogr_mod
+            import osgeo.osr as osr_mod
+        except ImportError:
+            # print("error with osgeo gdal import")
+            GDAL_INCLUDED = False
+            return GDAL_INCLUDED
+    
+    ogr = ogr_mod
+    osr = osr_mod
+    GDAL_INCLUDED = True
+    
+    return GDAL_INCLUDED
 
 class Geo:
     """
@@ -82,7 +105,7 @@ class Geo:
         
         pnt_array = [pnt1, pnt2, pnt3, pnt4]
         
-        if GDAL_INCLUDED:
+        if _load_gdal():
             # Create ring
             ring = ogr.Geometry(ogr.wkbLinearRing)
             ring.AddPoint(pnt1[0], pnt1[1])
@@ -124,7 +147,7 @@ class Geo:
         :rtype: ogr.Geometry
         """
         
-        if GDAL_INCLUDED:
+        if _load_gdal():
             out_poly = ogr.CreateGeometryFromWkt(in_feat)
         
         return out_poly
@@ -149,7 +172,7 @@ class Geo:
         ext = os.path.splitext(out_fn)[1]
         lyr_name = os.path.basename(out_fn).replace(ext, '')
         
-        if GDAL_INCLUDED:
+        if _load_gdal():
             
             if ext == '.gml':
                 ogr_driver = 'GML'
@@ -185,16 +208,26 @@ class Geo:
                 field_name.SetWidth(256)
                 lyr.CreateField(field_name)
             
+            # Get the index of each field once so the values are set 
+            #   without a lookup by name
+            field_idxs = [(featureDefn.GetFieldIndex(f), f) for f in fields]
+            
+            # Write all the features in a single transaction when the 
+            #   driver supports it
+            use_trans = lyr.TestCapability(ogr.OLCTransactions)
+            if use_trans:
+                lyr.StartTransaction()
+            
             for r in img_lst.get_images():
-                record_id = r.get_recordId()
                 poly = r.get_geometry('geom')
+                mdata = r.get_metadata()
 
                 # Create a new feature
                 feat = ogr.Feature(featureDefn)
                 
                 # Add field values
-                for f in fields:
-                    feat.SetField(f, str(r.get_metadata(f)))
+                for idx, f in field_idxs:
+                    feat.SetField(idx, str(mdata.get(f)))
                 
                 if ext == '.kml':
                     self.reverse_coords(poly)
@@ -204,6 +237,9 @@ class Geo:
 
                 # Add new feature to output Layer
                 lyr.CreateFeature(feat)
+            
+            if use_trans:
+                lyr.CommitTransaction()
 
             # Dereference the feature
             feat = None
@@ -247,7 +283,7 @@ class Geo:
         :rtype: str
         """
         
-        if GDAL_INCLUDED:
+        if _load_gdal():
             # Determine the OGR driver of the input AOI
             if self.aoi_fn.find('.gml') > -1:
                 ogr_driver = 'GML'
@@ -247,6 +247,9 @@ class ImageList:
         self.eod = eod
         self.img_lst = []
         
+        # The cached result of get_raw, reset whenever the list changes
+        self._raw = None
+        
     def add_image(self, in_image):
         """
         Adds an Image object to the ImageList.
@@ -260,6 +263,7 @@ class ImageList:
             image = Image()
             image.parse_record(in_image)
         self.img_lst.append(image)
+        self._raw = None
         
     def count(self):
         """
@@ -320,7 +324,10 @@ class ImageList:
         :rtype: list
         """
         
-        return [i.get_metadata() for i in self.img_lst]
+        if self._raw is None:
+            self._raw = [i.get_metadata() for i in self.img_lst]
+        
+        return self._raw
                 
     def get_subset(self, start=None, end=None):
         """
@@ -352,6 +359,8 @@ class ImageList:
         :type  results: list
         """
         
+        self._raw = None
+        
         for r in results:
             image = Image()
             if isCsv:
@@ -373,6 +382,8 @@ class ImageList:
         if isinstance(val, str):
             val = int(val)
         
+        self._raw = None
+        
         if collections is None:
             self.img_lst = self.img_lst[:val]
         else:
@@ -396,6 +407,8 @@ class ImageList:
         :type  download_items: list
         """
         
+        self._raw = None
+        
         for item in download_items:
             rec_id = item.get('recordId')
             img = self.get_image(rec_id)
@@ -545,7 +558,7 @@ class OrderItem:
             image.parse_record(in_image)
         self.image = image
         
-        fields = self.eod.eodms_rapi.get_collections()[self.image.get_collId()]\
+        fields = self.eod.get_collections()[self.image.get_collId()]\
                 ['fields']
         
         self.metadata['imageUrl'] = self.image.get_metadata('thisRecordUrl')